@@ -0,0 +1,44 @@
+import os
+import tempfile
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Кэш по умолчанию хранится в файлах, общих для всех процессов сервера
+# и management-команд: версии моделей и удаление записей при изменениях
+# должны быть видны каждому процессу. LocMemCache у каждого процесса
+# свой, поэтому c ним записи живут не дольше CATALOGUE_CACHE_TIMEOUT,
+# который по умолчанию сокращён до минуты.
+CACHE_BACKEND = os.environ.get(
+    "CACHE_BACKEND",
+    "django.core.cache.backends.filebased.FileBasedCache",
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION",
+            str(Path(tempfile.gettempdir()) / "movies_admin_cache"),
+        ),
+        "KEY_PREFIX": "movies_admin",
+    },
+}
+
+# Файловый и локальный кэши при переполнении удаляют случайные записи,
+# в том числе версии моделей. Лимит по умолчанию (300 записей) меньше
+# числа закэшированных фильмов, поэтому он поднят. RedisCache вытесняет
+# записи своей политикой и этот параметр не принимает.
+if not CACHE_BACKEND.endswith(".RedisCache"):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "50000")),
+    }
+
+CATALOGUE_CACHE_TIMEOUT = int(
+    os.environ.get(
+        "CATALOGUE_CACHE_TIMEOUT",
+        "60" if CACHE_BACKEND.endswith(".LocMemCache") else "3600",
+    ),
+)
@@ -4,6 +4,13 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Постоянные соединения по умолчанию выключены. Под ASGI каждый
+# запрос выполняет синхронный код в своём потоке, и при CONN_MAX_AGE > 0
+# каждый такой поток держит своё соединение, пока не исчерпает
+# max_connections. Соединения переиспользуются через PgBouncer
+# в режиме transaction pooling (DB_POOLER=pgbouncer); CONN_MAX_AGE
+# имеет смысл включать только для WSGI-сервера c фиксированным
+# числом потоков.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -12,8 +19,30 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD"),
         "HOST": os.environ.get("DB_HOST", "127.0.0.1"),
         "PORT": os.environ.get("DB_PORT", 5432),
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": (
+            os.environ.get("DB_CONN_HEALTH_CHECKS", "True") == "True"
+        ),
+        "DISABLE_SERVER_SIDE_CURSORS": (
+            os.environ.get("DB_POOLER") == "pgbouncer"
+        ),
         "OPTIONS": {
             "options": "-c search_path=public,content",
         },
     },
 }
+
+if os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ.get("DB_REPLICA_HOST"),
+        "PORT": os.environ.get(
+            "DB_REPLICA_PORT",
+            DATABASES["default"]["PORT"],
+        ),
+        "TEST": {
+            "MIRROR": "default",
+        },
+    }
+
+DATABASE_ROUTERS = ["movies.routers.ReadReplicaRouter"]
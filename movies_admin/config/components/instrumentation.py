@@ -0,0 +1,11 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", "50"))
+
+QUERY_TIME_BUDGET_MS = float(os.environ.get("QUERY_TIME_BUDGET_MS", "500"))
+
+SLOW_QUERY_COUNT = int(os.environ.get("SLOW_QUERY_COUNT", "5"))
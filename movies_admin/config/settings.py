@@ -29,8 +29,6 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
 
-    "debug_toolbar",
-
     "movies.apps.MoviesConfig",
 ]
 
@@ -43,9 +41,14 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "movies.middleware.QueryBudgetMiddleware",
+    "movies.middleware.ReplicaReadMiddleware",
 ]
 
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -111,4 +114,6 @@ LOCALE_PATHS = ['movies/locale']
 
 include(
     "components/database.py",
+    "components/cache.py",
+    "components/instrumentation.py",
 )
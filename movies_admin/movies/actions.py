@@ -0,0 +1,119 @@
+import logging
+from collections.abc import Iterator
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from .cache import invalidate_film_works
+from .models import FilmWork, Genre, GenreFilmWork, Person, PersonFilmWork
+
+BULK_CHUNK_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def iter_pk_chunks(
+        queryset: QuerySet[FilmWork],
+        chunk_size: int = BULK_CHUNK_SIZE,
+) -> Iterator[list]:
+    """Разбивает первичные ключи выборки на пачки, читая их
+    по ключу, a не через OFFSET. После обработки пачки сбрасывает
+    кэш её фильмов после фиксации транзакции.
+    """
+    queryset = queryset.prefetch_related(None).order_by("pk")
+    total = queryset.count()
+    processed = 0
+    last_pk = None
+
+    while True:
+        chunk_queryset = queryset
+        if last_pk is not None:
+            chunk_queryset = chunk_queryset.filter(pk__gt=last_pk)
+        chunk = list(
+            chunk_queryset.values_list("pk", flat=True)[:chunk_size],
+        )
+        if not chunk:
+            break
+
+        yield chunk
+
+        transaction.on_commit(partial(invalidate_film_works, chunk))
+        processed += len(chunk)
+        last_pk = chunk[-1]
+        logger.info(f"Bulk action processed {processed}/{total} film works")
+
+
+def bulk_update_film_works(
+        queryset: QuerySet[FilmWork],
+        **values: object,
+) -> int:
+    """Обновляет поля фильмов одним запросом на пачку."""
+    updated = 0
+    for chunk in iter_pk_chunks(queryset):
+        with transaction.atomic():
+            updated += FilmWork.objects.filter(pk__in=chunk).update(
+                updated_at=timezone.now(),
+                **values,
+            )
+    return updated
+
+
+def bulk_add_genre(queryset: QuerySet[FilmWork], genre: Genre) -> int:
+    """Добавляет жанр фильмам, пропуская уже существующие связи."""
+    processed = 0
+    for chunk in iter_pk_chunks(queryset):
+        with transaction.atomic():
+            GenreFilmWork.objects.bulk_create(
+                (
+                    GenreFilmWork(film_work_id=pk, genre=genre)
+                    for pk in chunk
+                ),
+                ignore_conflicts=True,
+            )
+            FilmWork.objects.filter(pk__in=chunk).update(
+                updated_at=timezone.now(),
+            )
+        processed += len(chunk)
+    return processed
+
+
+def bulk_add_person(
+        queryset: QuerySet[FilmWork],
+        person: Person,
+        role: str,
+) -> int:
+    """Добавляет персону в заданной роли фильмам, в которых её ещё
+    нет в этой роли.
+    """
+    processed = 0
+    for chunk in iter_pk_chunks(queryset):
+        with transaction.atomic():
+            film_work_ids = (
+                FilmWork.objects
+                .filter(pk__in=chunk)
+                .exclude(
+                    Exists(
+                        PersonFilmWork.objects.filter(
+                            film_work=OuterRef("pk"),
+                            person=person,
+                            role=role,
+                        ),
+                    ),
+                )
+                .values_list("pk", flat=True)
+            )
+            PersonFilmWork.objects.bulk_create(
+                (
+                    PersonFilmWork(film_work_id=pk, person=person, role=role)
+                    for pk in film_work_ids
+                ),
+                ignore_conflicts=True,
+            )
+            FilmWork.objects.filter(pk__in=chunk).update(
+                updated_at=timezone.now(),
+            )
+        processed += len(chunk)
+    return processed
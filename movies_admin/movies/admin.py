@@ -1,9 +1,103 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import BadRequest, PermissionDenied
+from django.core.paginator import Paginator
+from django.db import models
 from django.db.models.query import QuerySet
+from django.forms.models import BaseInlineFormSet
+from django.http import Http404, StreamingHttpResponse
 from django.http.request import HttpRequest
+from django.template.response import TemplateResponse
+from django.urls import URLPattern, path
 from django.utils.translation import gettext_lazy as _
 
-from .models import FilmWork, Genre, GenreFilmWork, Person, PersonFilmWork
+from .actions import bulk_add_genre, bulk_add_person, bulk_update_film_works
+from .exports import EXPORT_FORMATS, export_response
+from .filters import CachedAllValuesFieldListFilter
+from .forms import (
+    FilmWorkActionForm,
+    PreloadedAutocompleteSelect,
+    preload_autocomplete_choices,
+)
+from .models import (
+    FilmWork,
+    FilmWorkCatalog,
+    FilmWorkType,
+    Genre,
+    GenreFilmWork,
+    Person,
+    PersonFilmWork,
+    PersonRole,
+)
+from .statistics import get_catalogue_statistics
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    """Inline formset, отображающий только одну страницу связанных
+    объектов.
+    """
+
+    per_page = 50
+    page_param = "page"
+    page_number = 1
+    query_params = None
+
+    def get_queryset(self) -> QuerySet:
+        if not hasattr(self, "_queryset"):
+            self.paginator = Paginator(super().get_queryset(), self.per_page)
+            self.page = self.paginator.get_page(self.page_number)
+            self._queryset = self.page.object_list
+        return self._queryset
+
+    def _construct_form(
+            self,
+            i: int,
+            **kwargs,  # noqa: ANN003
+    ) -> forms.ModelForm:
+        form = super()._construct_form(i, **kwargs)
+        preload_autocomplete_choices(form)
+        return form
+
+    @property
+    def page_links(self) -> list[tuple[int | str, str | None]]:
+        """Возвращает номера страниц и строки запроса для ссылок
+        на них.
+        """
+        self.get_queryset()
+        links = []
+        for number in self.paginator.get_elided_page_range(self.page.number):
+            if number == self.paginator.ELLIPSIS:
+                links.append((number, None))
+                continue
+            params = self.query_params.copy()
+            params[self.page_param] = number
+            links.append((number, params.urlencode()))
+        return links
+
+
+class PaginatedInlineMixin:
+    """Разбивает inline на страницы, номер которых передаётся
+    в GET-параметре ``<model_name>_page``.
+    """
+
+    formset = PaginatedInlineFormSet
+    template = "admin/edit_inline/paginated_tabular.html"
+    per_page = 50
+
+    def get_formset(
+            self,
+            request: HttpRequest,
+            obj: FilmWork | None = None,
+            **kwargs,  # noqa: ANN003
+    ) -> type[PaginatedInlineFormSet]:
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.per_page = self.per_page
+        formset.page_param = f"{self.opts.model_name}_page"
+        formset.page_number = request.GET.get(formset.page_param, 1)
+        formset.query_params = request.GET
+        return formset
 
 
 class GenreFilmWorkInline(admin.TabularInline):
@@ -12,16 +106,67 @@ class GenreFilmWorkInline(admin.TabularInline):
     verbose_name_plural = _("genres")
     extra = 0
 
-class PersonFilmWorkInline(admin.TabularInline):
+    def get_queryset(self, request: HttpRequest) -> QuerySet[GenreFilmWork]:
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("film_work", "genre")
+        )
+
+class PersonFilmWorkInline(PaginatedInlineMixin, admin.TabularInline):
     model = PersonFilmWork
     autocomplete_fields = ("person", )
     verbose_name = _("person")
     verbose_name_plural = _("persons")
     extra = 0
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[PersonFilmWork]:
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("film_work", "person")
+            .order_by("role", "person__full_name", "id")
+        )
+
+    def formfield_for_foreignkey(
+            self,
+            db_field: models.ForeignKey,
+            request: HttpRequest,
+            **kwargs,  # noqa: ANN003
+    ) -> forms.ModelChoiceField:
+        """Подписывает выбранных персон по объектам, загруженным
+        через select_related, a не отдельным запросом на каждую строку.
+        """
+        if db_field.name == "person":
+            kwargs["widget"] = PreloadedAutocompleteSelect(
+                db_field,
+                self.admin_site,
+                using=kwargs.get("using"),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+class FilmWorkExportChangeList(ChangeList):
+    """Применяет фильтры и поиск списка фильмов, не подсчитывая
+    и не загружая страницу результатов.
+    """
+
+    def get_results(self, request: HttpRequest):
+        pass
+
+
 @admin.register(FilmWork)
 class FilmworkAdmin(admin.ModelAdmin):
     inlines = (GenreFilmWorkInline, PersonFilmWorkInline)
+    action_form = FilmWorkActionForm
+    actions = (
+        "mark_as_movie",
+        "mark_as_tv_show",
+        "set_rating",
+        "add_genre",
+        "add_person",
+        "export_csv",
+        "export_json",
+    )
 
     list_display = (
         "title",
@@ -30,7 +175,7 @@ class FilmworkAdmin(admin.ModelAdmin):
         "get_genres",
         "rating",
     )
-    list_filter = ("type", "rating")
+    list_filter = ("type", ("rating", CachedAllValuesFieldListFilter))
     search_fields = ("title", "description", "id")
     list_prefetch_related = ("genres",)
 
@@ -42,16 +187,240 @@ class FilmworkAdmin(admin.ModelAdmin):
         )
 
     def get_genres(self, obj: FilmWork):
-        return list(obj.genres.values_list("name", flat=True))
+        return [genre.name for genre in obj.genres.all()]
+
+    def get_urls(self) -> list[URLPattern]:
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                "export/<str:export_format>/",
+                self.admin_site.admin_view(self.export_view),
+                name="{}_{}_export".format(*info),
+            ),
+            path(
+                "statistics/",
+                self.admin_site.admin_view(self.statistics_view),
+                name="{}_{}_statistics".format(*info),
+            ),
+            *super().get_urls(),
+        ]
+
+    def get_changelist(
+            self,
+            request: HttpRequest,
+            **kwargs,  # noqa: ANN003
+    ) -> type[ChangeList]:
+        if request.resolver_match.url_name.endswith("_export"):
+            return FilmWorkExportChangeList
+        return super().get_changelist(request, **kwargs)
+
+    def export_view(
+            self,
+            request: HttpRequest,
+            export_format: str,
+    ) -> StreamingHttpResponse:
+        """Выгружает фильмы, отобранные фильтрами и поиском списка."""
+        if export_format not in EXPORT_FORMATS:
+            raise Http404
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            changelist = self.get_changelist_instance(request)
+        except IncorrectLookupParameters as exc:
+            raise BadRequest from exc
+        return export_response(changelist.queryset, export_format)
+
+    def statistics_view(self, request: HttpRequest) -> TemplateResponse:
+        """Показывает распределения фильмов по рейтингу, типу и году
+        выхода, a также самые популярные жанры и персоны.
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.opts,
+            "title": _("Catalogue statistics"),
+            **get_catalogue_statistics(),
+        }
+        return TemplateResponse(
+            request,
+            "admin/movies/filmwork/statistics.html",
+            context,
+        )
+
+    def get_action_form_data(self, request: HttpRequest) -> dict | None:
+        """Возвращает проверенные параметры формы действий или None,
+        если форма заполнена неверно.
+        """
+        form = self.action_form(request.POST)
+        form.fields["action"].choices = self.get_action_choices(request)
+        if not form.is_valid():
+            self.message_user(
+                request,
+                _("Invalid action parameters."),
+                messages.ERROR,
+            )
+            return None
+        return form.cleaned_data
+
+    def message_bulk_result(self, request: HttpRequest, count: int):
+        self.message_user(
+            request,
+            _("%(count)d film works processed.") % {"count": count},
+            messages.SUCCESS,
+        )
+
+    @admin.action(
+        description=_("Mark selected film works as movies"),
+        permissions=("change",),
+    )
+    def mark_as_movie(
+            self,
+            request: HttpRequest,
+            queryset: QuerySet[FilmWork],
+    ):
+        count = bulk_update_film_works(queryset, type=FilmWorkType.MOVIE)
+        self.message_bulk_result(request, count)
+
+    @admin.action(
+        description=_("Mark selected film works as TV shows"),
+        permissions=("change",),
+    )
+    def mark_as_tv_show(
+            self,
+            request: HttpRequest,
+            queryset: QuerySet[FilmWork],
+    ):
+        count = bulk_update_film_works(queryset, type=FilmWorkType.TV_SHOW)
+        self.message_bulk_result(request, count)
+
+    @admin.action(
+        description=_("Set rating of selected film works"),
+        permissions=("change",),
+    )
+    def set_rating(self, request: HttpRequest, queryset: QuerySet[FilmWork]):
+        data = self.get_action_form_data(request)
+        if data is None:
+            return
+        if data["rating"] is None:
+            self.message_user(
+                request,
+                _("Enter a rating."),
+                messages.ERROR,
+            )
+            return
+        count = bulk_update_film_works(queryset, rating=data["rating"])
+        self.message_bulk_result(request, count)
+
+    @admin.action(
+        description=_("Add genre to selected film works"),
+        permissions=("change",),
+    )
+    def add_genre(self, request: HttpRequest, queryset: QuerySet[FilmWork]):
+        data = self.get_action_form_data(request)
+        if data is None:
+            return
+        if data["genre"] is None:
+            self.message_user(
+                request,
+                _("Select a genre."),
+                messages.ERROR,
+            )
+            return
+        count = bulk_add_genre(queryset, data["genre"])
+        self.message_bulk_result(request, count)
+
+    @admin.action(
+        description=_("Add person to selected film works"),
+        permissions=("change",),
+    )
+    def add_person(self, request: HttpRequest, queryset: QuerySet[FilmWork]):
+        data = self.get_action_form_data(request)
+        if data is None:
+            return
+        person = (
+            data["person"]
+            and Person.objects.filter(pk=data["person"]).first()
+        )
+        if not person:
+            self.message_user(
+                request,
+                _("Enter an existing person id."),
+                messages.ERROR,
+            )
+            return
+        count = bulk_add_person(
+            queryset,
+            person,
+            data["role"] or PersonRole.ACTOR,
+        )
+        self.message_bulk_result(request, count)
+
+    @admin.action(description=_("Export selected film works to CSV"))
+    def export_csv(
+            self,
+            request: HttpRequest,
+            queryset: QuerySet[FilmWork],
+    ) -> StreamingHttpResponse:
+        return export_response(queryset, "csv")
+
+    @admin.action(description=_("Export selected film works to JSON"))
+    def export_json(
+            self,
+            request: HttpRequest,
+            queryset: QuerySet[FilmWork],
+    ) -> StreamingHttpResponse:
+        return export_response(queryset, "json")
 
 
 
 @admin.register(Genre)
 class GenreAdmin(admin.ModelAdmin):
-   list_display = ("name",)
+   list_display = ("name", "film_count")
+   readonly_fields = ("film_count",)
    search_fields = ("name", "id")
 
 @admin.register(Person)
 class PersonAdmin(admin.ModelAdmin):
-    list_display = ("full_name",)
+    list_display = ("full_name", "film_count")
+    readonly_fields = ("film_count",)
     search_fields = ("full_name", "id")
+
+
+@admin.register(FilmWorkCatalog)
+class FilmWorkCatalogAdmin(admin.ModelAdmin):
+    list_display = (
+        "title",
+        "type",
+        "creation_date",
+        "get_genres",
+        "get_directors",
+        "rating",
+    )
+    list_filter = ("type", ("rating", CachedAllValuesFieldListFilter))
+    search_fields = ("title", "description", "id")
+
+    @admin.display(description=_("genres"))
+    def get_genres(self, obj: FilmWorkCatalog):
+        return ", ".join(obj.genres)
+
+    @admin.display(description=_("directors"))
+    def get_directors(self, obj: FilmWorkCatalog):
+        return ", ".join(obj.directors)
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+            self,
+            request: HttpRequest,
+            obj: FilmWorkCatalog | None = None,
+    ) -> bool:
+        return False
+
+    def has_delete_permission(
+            self,
+            request: HttpRequest,
+            obj: FilmWorkCatalog | None = None,
+    ) -> bool:
+        return False
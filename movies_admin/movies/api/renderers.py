@@ -0,0 +1,30 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data: object) -> bytes:
+    """Сериализует данные в JSON, используя orjson, если он
+    установлен.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(
+        data,
+        cls=DjangoJSONEncoder,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+class JSONResponse(HttpResponse):
+
+    def __init__(self, data: object, **kwargs):  # noqa: ANN003
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(dumps(data), **kwargs)
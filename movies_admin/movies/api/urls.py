@@ -0,0 +1,15 @@
+from django.urls import path
+
+from . import views
+
+app_name = "api"
+
+urlpatterns = [
+    path("movies/", views.film_work_list, name="film_work_list"),
+    path(
+        "movies/<uuid:pk>/",
+        views.film_work_detail,
+        name="film_work_detail",
+    ),
+    path("genres/", views.genre_list, name="genre_list"),
+]
@@ -0,0 +1,184 @@
+import hashlib
+import uuid
+
+from django.core.exceptions import BadRequest
+from django.db.models.query import QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+
+from movies.cache import film_work_detail_key, genre_list_key, get_or_compute
+from movies.models import FilmWork, Genre, PersonRole
+
+from .renderers import JSONResponse, dumps
+
+FILM_WORK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "creation_date",
+    "rating",
+    "type",
+    "updated_at",
+    "genre_names",
+    "actor_names",
+    "director_names",
+    "writer_names",
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+def get_page_size(request: HttpRequest) -> int:
+    try:
+        page_size = int(request.GET.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return DEFAULT_PAGE_SIZE
+    return min(max(page_size, 1), MAX_PAGE_SIZE)
+
+
+def get_cursor(request: HttpRequest) -> uuid.UUID | None:
+    cursor = request.GET.get("cursor")
+    if not cursor:
+        return None
+    try:
+        return uuid.UUID(cursor)
+    except ValueError as exc:
+        raise BadRequest from exc
+
+
+def get_etag(content: bytes) -> str:
+    """Возвращает ETag по сериализованному ответу.
+
+    Хеш считается по всему содержимому, a не по updated_at фильмов:
+    переименование жанра или персоны и объединение дублей персон
+    меняют ответ, не меняя updated_at фильма.
+    """
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def conditional_json_response(
+        request: HttpRequest,
+        data: object,
+) -> HttpResponse:
+    """Отвечает 304, если клиент уже получил эти данные, иначе
+    отдаёт их. Данные сериализуются один раз и для ETag, и для ответа.
+    """
+    content = dumps(data)
+    etag = get_etag(content)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type="application/json")
+    response.headers["ETag"] = etag
+    return response
+
+
+def film_work_list_queryset(
+        cursor: uuid.UUID | None,
+        page_size: int,
+) -> QuerySet:
+    """Страница фильмов после курсора c одной лишней строкой для
+    определения наличия следующей страницы.
+    """
+    queryset = FilmWork.objects.order_by("id")
+    if cursor is not None:
+        queryset = queryset.filter(id__gt=cursor)
+    return queryset.with_credits().values(*FILM_WORK_FIELDS)[:page_size + 1]
+
+
+def film_work_detail_queryset(pk: uuid.UUID) -> QuerySet:
+    return FilmWork.objects.filter(pk=pk).with_credits().values(
+        *FILM_WORK_FIELDS,
+    )
+
+
+def film_work_list_response(
+        request: HttpRequest,
+        rows: list[dict],
+        page_size: int,
+        url_name: str,
+) -> HttpResponse:
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_url = request.build_absolute_uri(
+            f"{reverse(url_name)}"
+            f"?cursor={rows[-1]['id']}&page_size={page_size}",
+        )
+
+    return conditional_json_response(
+        request,
+        {"results": rows, "next": next_url},
+    )
+
+
+def build_film_work_detail(row: dict | None) -> dict | None:
+    """Добавляет к фильму количество жанров и персон по ролям.
+
+    Количества считаются по массивам with_credits, поэтому фильм
+    c количествами читается одним запросом.
+    """
+    if row is None:
+        return None
+    row["counts"] = {
+        "genres": len(row["genre_names"]),
+        **{
+            role: len(row[f"{role}_names"])
+            for role in PersonRole.values
+        },
+    }
+    return row
+
+
+def film_work_detail_response(
+        request: HttpRequest,
+        row: dict | None,
+) -> HttpResponse:
+    if row is None:
+        raise Http404
+
+    return conditional_json_response(request, row)
+
+
+@require_safe
+def film_work_list(request: HttpRequest) -> HttpResponse:
+    """Список фильмов c постраничной навигацией по ключу."""
+    page_size = get_page_size(request)
+    cursor = get_cursor(request)
+    rows = list(film_work_list_queryset(cursor, page_size))
+    return film_work_list_response(
+        request,
+        rows,
+        page_size,
+        "api:film_work_list",
+    )
+
+
+@require_safe
+def film_work_detail(request: HttpRequest, pk: uuid.UUID) -> HttpResponse:
+    """Фильм c жанрами, персонами и количеством связей."""
+    row = get_or_compute(
+        "film_work_detail",
+        film_work_detail_key(pk),
+        lambda: build_film_work_detail(
+            film_work_detail_queryset(pk).first(),
+        ),
+    )
+    return film_work_detail_response(request, row)
+
+
+@require_safe
+def genre_list(request: HttpRequest) -> HttpResponse:
+    """Список всех жанров."""
+    genres = get_or_compute(
+        "genre_list",
+        genre_list_key(),
+        lambda: list(
+            Genre.objects
+            .order_by("name")
+            .values("id", "name", "description"),
+        ),
+    )
+    return JSONResponse({"results": genres})
@@ -0,0 +1,188 @@
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+
+from .models import FilmWork, Genre
+from .routers import read_primary
+
+CATALOGUE_CACHE_TIMEOUT: int = getattr(
+    settings,
+    "CATALOGUE_CACHE_TIMEOUT",
+    60 * 60,
+)
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 5
+LOCK_POLL_INTERVAL = 0.05
+
+MISSING = object()
+
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+def record(name: str, outcome: str):
+    with _stats_lock:
+        _stats[f"{name}:{outcome}"] += 1
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """Возвращает количество попаданий и промахов кэша в текущем
+    процессе по именам записей.
+    """
+    stats: dict[str, dict[str, int]] = {}
+    with _stats_lock:
+        for key, count in _stats.items():
+            name, outcome = key.rsplit(":", 1)
+            stats.setdefault(name, {"hit": 0, "miss": 0})[outcome] = count
+    return stats
+
+
+def version_key(model: type[models.Model]) -> str:
+    return f"movies:version:{model._meta.label_lower}"
+
+
+def initial_version() -> int:
+    """Начальная версия модели.
+
+    Ключ версии может быть вытеснен из кэша. Если бы версии
+    начинались заново c единицы, записи, построенные по прежним
+    версиям, снова стали бы действительными. Время в наносекундах
+    не повторяет ни одну из выданных ранее версий.
+    """
+    return time.time_ns()
+
+
+def get_versions(model_classes: Iterable[type[models.Model]]) -> list[int]:
+    """Возвращает текущие версии моделей одним обращением к кэшу."""
+    keys = [version_key(model) for model in model_classes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = initial_version()
+            cache.add(key, version, timeout=None)
+            versions[key] = cache.get(key, version)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model: type[models.Model]):
+    """Делает недействительными все записи, зависящие от модели."""
+    key = version_key(model)
+    if cache.add(key, initial_version(), timeout=None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, initial_version(), timeout=None)
+
+
+def make_key(
+        name: str,
+        *parts: object,
+        depends_on: Iterable[type[models.Model]] = (),
+) -> str:
+    """Строит ключ записи, включающий версии моделей,
+    от которых она зависит.
+    """
+    depends_on = tuple(depends_on)
+    versions = ":".join(
+        f"{model._meta.model_name}{version}"
+        for model, version in zip(
+            depends_on,
+            get_versions(depends_on),
+            strict=True,
+        )
+    )
+    return ":".join(("movies", name, versions, *map(str, parts)))
+
+
+def compute_on_primary(compute: Callable[[], object]) -> object:
+    """Вычисляет значение для кэша по основной базе.
+
+    Запись кэша удаляется сразу после фиксации изменения в основной
+    базе. Значение, прочитанное c отстающей реплики, вернуло бы в кэш
+    устаревшие данные на всё время жизни записи.
+    """
+    with read_primary():
+        return compute()
+
+
+def get_or_compute(
+        name: str,
+        key: str,
+        compute: Callable[[], object],
+        timeout: int = CATALOGUE_CACHE_TIMEOUT,
+) -> object:
+    """Возвращает значение из кэша, a при промахе вычисляет и сохраняет.
+
+    При промахе значение вычисляет только процесс, захвативший
+    блокировку; остальные ждут готового значения до ``LOCK_WAIT`` секунд,
+    чтобы истёкшая запись не вызывала волну одинаковых запросов к базе.
+    Процесс, так и не дождавшийся значения, вычисляет значение сам
+    и не трогает чужую блокировку, a владелец снимает блокировку,
+    только пока она принадлежит этому процессу.
+    """
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        record(name, "hit")
+        return value
+
+    record(name, "miss")
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, timeout=LOCK_TIMEOUT):
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            value = cache.get(key, MISSING)
+            if value is not MISSING:
+                return value
+        value = compute_on_primary(compute)
+        cache.set(key, value, timeout=timeout)
+        return value
+
+    try:
+        value = compute_on_primary(compute)
+        cache.set(key, value, timeout=timeout)
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    return value
+
+
+def film_work_detail_key(pk: object) -> str:
+    """Ключ данных фильма. Он не зависит от версий жанров и персон:
+    при их изменении удаляются записи только связанных фильмов.
+    """
+    return make_key("film_work_detail", pk)
+
+
+def genre_list_key() -> str:
+    return make_key("genre_list", depends_on=(Genre,))
+
+
+def filter_choices_key(model: type[models.Model], field_path: str) -> str:
+    return make_key(
+        "filter_choices",
+        model._meta.label_lower,
+        field_path,
+        depends_on=(model,),
+    )
+
+
+def invalidate_film_work_details(pks: Iterable[object]):
+    """Удаляет закэшированные данные фильмов."""
+    cache.delete_many([film_work_detail_key(pk) for pk in pks])
+
+
+def invalidate_film_works(pks: Iterable[object]):
+    """Удаляет закэшированные данные фильмов и значения фильтров
+    списка фильмов.
+    """
+    invalidate_film_work_details(pks)
+    bump_version(FilmWork)
@@ -0,0 +1,149 @@
+"""Поиск дублей персон по ключам блокировки.
+
+Модуль не импортирует Django, чтобы функции сравнения можно было
+выполнять в дочерних процессах.
+"""
+import unicodedata
+import uuid
+from difflib import SequenceMatcher
+
+NAME_BLOCK_LENGTH = 16
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+# Персона: идентификатор, имя и количество фильмов.
+PersonRow = tuple[uuid.UUID, str, int]
+
+
+def normalize_name(full_name: str) -> str:
+    """Приводит имя к нижнему регистру, убирает диакритику
+    и все символы, кроме букв.
+    """
+    decomposed = unicodedata.normalize("NFKD", full_name.casefold())
+    letters = (
+        char if char.isalpha() else " "
+        for char in decomposed
+        if not unicodedata.combining(char)
+    )
+    return " ".join("".join(letters).split())
+
+
+def soundex(word: str) -> str:
+    """Возвращает фонетический код Soundex латинского слова.
+
+    Для слов без латинских букв возвращает их первые четыре буквы.
+    """
+    latin = [char for char in word if "a" <= char <= "z"]
+    if not latin:
+        return word[:4]
+    code = latin[0].upper()
+    previous = SOUNDEX_CODES.get(latin[0], "")
+    for char in latin[1:]:
+        digit = SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def make_name_block(full_name: str) -> str:
+    """Строит ключ блокировки: код Soundex фамилии (последнего слова)
+    и первую букву имени. Дубли c опечатками и другой транслитерацией
+    обычно попадают в один блок.
+    """
+    words = normalize_name(full_name).split()
+    if not words:
+        return ""
+    block = soundex(words[-1])
+    if len(words) > 1:
+        block += words[0][0]
+    return block[:NAME_BLOCK_LENGTH]
+
+
+def group_similar_names(
+        names: list[str],
+        threshold: float,
+) -> dict[str, str]:
+    """Объединяет похожие имена в группы и возвращает для каждого
+    имени представителя группы.
+
+    Перед точным сравнением применяются быстрые верхние оценки
+    похожести, которые отсеивают большинство пар.
+    """
+    parents = {name: name for name in names}
+
+    def find(name: str) -> str:
+        while parents[name] != name:
+            parents[name] = parents[parents[name]]
+            name = parents[name]
+        return name
+
+    for index, name in enumerate(names):
+        matcher = SequenceMatcher(None, b=name)
+        for other in names[index + 1:]:
+            matcher.set_seq1(other)
+            if (
+                matcher.real_quick_ratio() >= threshold
+                and matcher.quick_ratio() >= threshold
+                and matcher.ratio() >= threshold
+            ):
+                parents[find(other)] = find(name)
+    return {name: find(name) for name in names}
+
+
+def find_block_duplicates(
+        persons: list[PersonRow],
+        threshold: float,
+) -> list[tuple[PersonRow, PersonRow, float]]:
+    """Находит дубли внутри одного блока.
+
+    Персоны c одинаковым нормализованным именем объединяются сразу,
+    и попарно сравниваются только различные имена. Для каждой группы
+    возвращаются пары (основная персона, дубль, похожесть), где
+    основная персона участвует в наибольшем количестве фильмов.
+    """
+    by_name: dict[str, list[PersonRow]] = {}
+    for person in persons:
+        by_name.setdefault(normalize_name(person[1]), []).append(person)
+
+    groups: dict[str, list[PersonRow]] = {}
+    for name, root in group_similar_names(list(by_name), threshold).items():
+        groups.setdefault(root, []).extend(by_name[name])
+
+    pairs = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        keep = max(members, key=lambda person: (person[2], -person[0].int))
+        keep_name = normalize_name(keep[1])
+        for person in members:
+            if person is keep:
+                continue
+            score = SequenceMatcher(
+                None,
+                keep_name,
+                normalize_name(person[1]),
+            ).ratio()
+            pairs.append((keep, person, round(score, 3)))
+    return pairs
+
+
+def find_duplicates(
+        blocks: list[list[PersonRow]],
+        threshold: float,
+) -> list[tuple[PersonRow, PersonRow, float]]:
+    """Находит дубли в нескольких блоках за одну задачу процесса."""
+    return [
+        pair
+        for block in blocks
+        for pair in find_block_duplicates(block, threshold)
+    ]
@@ -0,0 +1,105 @@
+import csv
+import json
+from collections.abc import Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+
+from .models import FilmWorkQuerySet
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "creation_date",
+    "rating",
+    "type",
+    "genre_names",
+    "actor_names",
+    "director_names",
+    "writer_names",
+)
+
+ARRAY_FIELDS = (
+    "genre_names",
+    "actor_names",
+    "director_names",
+    "writer_names",
+)
+
+
+class Echo:
+    """Псевдобуфер, возвращающий записанную строку вместо её
+    сохранения.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_export_rows(queryset: FilmWorkQuerySet) -> Iterator[dict]:
+    """Итерирует фильмы c жанрами и персонами через серверный курсор,
+    не загружая выборку в память целиком.
+
+    Выборка читается внутри транзакции. Вне неё Django объявляет
+    курсор WITH HOLD, и Postgres вычисляет всю выборку до отдачи
+    первой строки.
+    """
+    with transaction.atomic(using=queryset.db):
+        yield from (
+            queryset
+            .prefetch_related(None)
+            .with_credits()
+            .order_by("pk")
+            .values(*EXPORT_FIELDS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+
+def iter_csv(queryset: FilmWorkQuerySet) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in iter_export_rows(queryset):
+        for field in ARRAY_FIELDS:
+            row[field] = ", ".join(row[field])
+        yield writer.writerow(row.values())
+
+
+def iter_json(queryset: FilmWorkQuerySet) -> Iterator[str]:
+    separator = "[\n"
+    for row in iter_export_rows(queryset):
+        yield separator + json.dumps(
+            row,
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+        )
+        separator = ",\n"
+    yield "[]\n" if separator == "[\n" else "\n]\n"
+
+
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv; charset=utf-8"),
+    "json": (iter_json, "application/json"),
+}
+
+
+def export_response(
+        queryset: FilmWorkQuerySet,
+        export_format: str,
+) -> StreamingHttpResponse:
+    """Возвращает потоковый ответ c выгрузкой фильмов в заданном
+    формате.
+    """
+    iter_content, content_type = EXPORT_FORMATS[export_format]
+    return StreamingHttpResponse(
+        iter_content(queryset),
+        content_type=content_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="film_works.{export_format}"'
+            ),
+        },
+    )
@@ -0,0 +1,35 @@
+from django.contrib import admin
+from django.db import models
+from django.http.request import HttpRequest
+
+from .cache import filter_choices_key, get_or_compute
+
+
+class CachedAllValuesFieldListFilter(admin.AllValuesFieldListFilter):
+    """Фильтр по всем значениям поля, список которых берётся
+    из кэша, a не из ``SELECT DISTINCT`` на каждый запрос.
+    """
+
+    def __init__(
+            self,
+            field: models.Field,
+            request: HttpRequest,
+            params: dict,
+            model: type[models.Model],
+            model_admin: admin.ModelAdmin,
+            field_path: str,
+    ):
+        super().__init__(
+            field,
+            request,
+            params,
+            model,
+            model_admin,
+            field_path,
+        )
+        lookup_choices = self.lookup_choices
+        self.lookup_choices = get_or_compute(
+            "filter_choices",
+            filter_choices_key(model, field_path),
+            lambda: list(lookup_choices),
+        )
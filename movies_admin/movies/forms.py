@@ -0,0 +1,96 @@
+from django import forms
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils.translation import gettext_lazy as _
+
+from .models import Genre, PersonRole
+
+
+class FilmWorkActionForm(ActionForm):
+    """Форма действий над фильмами c параметрами массовых изменений."""
+
+    rating = forms.FloatField(
+        label=_("rating"),
+        required=False,
+        validators=[
+            MinValueValidator(0),
+            MaxValueValidator(10),
+        ],
+    )
+    genre = forms.ModelChoiceField(
+        label=_("genre"),
+        queryset=Genre.objects.order_by("name"),
+        required=False,
+    )
+    person = forms.UUIDField(label=_("person id"), required=False)
+    role = forms.ChoiceField(
+        label=_("role"),
+        choices=PersonRole.choices,
+        initial=PersonRole.ACTOR,
+        required=False,
+    )
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """Виджет автодополнения, который подписывает выбранное значение
+    по уже загруженному объекту, без запроса для каждой формы.
+    """
+
+    preloaded = None
+
+    def optgroups(
+            self,
+            name: str,
+            value: list,
+            attr: dict | None = None,
+    ) -> list:
+        selected = [
+            str(item) for item in value
+            if str(item) not in self.choices.field.empty_values
+        ]
+        if not selected or not all(
+            pk in (self.preloaded or {}) for pk in selected
+        ):
+            return super().optgroups(name, value, attr)
+
+        default = (None, [], 0)
+        if not self.is_required and not self.allow_multiple_selected:
+            default[1].append(
+                self.create_option(
+                    name,
+                    value="",
+                    label="",
+                    selected=False,
+                    index=0,
+                ),
+            )
+        for pk in selected:
+            default[1].append(
+                self.create_option(
+                    name,
+                    value=pk,
+                    label=self.choices.field.label_from_instance(
+                        self.preloaded[pk],
+                    ),
+                    selected=True,
+                    index=len(default[1]),
+                ),
+            )
+        return [default]
+
+
+def preload_autocomplete_choices(form: forms.ModelForm):
+    """Передаёт виджетам автодополнения связанные объекты, уже
+    загруженные в экземпляр формы через select_related.
+    """
+    for name, field in form.fields.items():
+        widget = getattr(field.widget, "widget", field.widget)
+        if not isinstance(widget, PreloadedAutocompleteSelect):
+            continue
+        model_field = form.instance._meta.get_field(name)
+        if not model_field.is_cached(form.instance):
+            continue
+        related = model_field.get_cached_value(form.instance)
+        if related is not None:
+            widget.preloaded = {str(related.pk): related}
@@ -0,0 +1,121 @@
+import heapq
+import threading
+import time
+from collections.abc import Callable
+
+from django.conf import settings
+
+SLOW_QUERY_COUNT: int = getattr(settings, "SLOW_QUERY_COUNT", 5)
+SQL_PREVIEW_LENGTH = 500
+
+_metrics: dict[str, dict] = {}
+_metrics_lock = threading.Lock()
+
+
+class QueryRecorder:
+    """Обёртка выполнения запросов для ``connection.execute_wrapper``,
+    считающая количество и время запросов и запоминающая самые
+    медленные из них.
+    """
+
+    def __init__(
+            self,
+            slow_query_count: int = SLOW_QUERY_COUNT,
+            keep_queries: bool = False,
+    ):
+        self.slow_query_count = slow_query_count
+        self.keep_queries = keep_queries
+        self.count = 0
+        self.duration = 0.0
+        self.slowest: list[tuple[float, int, str]] = []
+        self.queries: list[str] = []
+
+    def __call__(
+            self,
+            execute: Callable,
+            sql: str,
+            params: object,
+            many: bool,
+            context: dict,
+    ) -> object:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            preview = sql[:SQL_PREVIEW_LENGTH]
+            if self.keep_queries:
+                self.queries.append(preview)
+            item = (duration, self.count, preview)
+            if len(self.slowest) < self.slow_query_count:
+                heapq.heappush(self.slowest, item)
+            else:
+                heapq.heappushpop(self.slowest, item)
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+    def get_slowest(self) -> list[dict]:
+        return [
+            {"duration_ms": round(duration * 1000, 2), "sql": sql}
+            for duration, _, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+def record_request(
+        view_name: str,
+        recorder: QueryRecorder,
+        over_budget: bool,
+):
+    """Добавляет показатели запроса к статистике представления."""
+    with _metrics_lock:
+        metrics = _metrics.setdefault(
+            view_name,
+            {
+                "requests": 0,
+                "queries": 0,
+                "db_time_ms": 0.0,
+                "max_queries": 0,
+                "max_db_time_ms": 0.0,
+                "over_budget": 0,
+            },
+        )
+        metrics["requests"] += 1
+        metrics["queries"] += recorder.count
+        metrics["db_time_ms"] += recorder.duration_ms
+        metrics["max_queries"] = max(metrics["max_queries"], recorder.count)
+        metrics["max_db_time_ms"] = max(
+            metrics["max_db_time_ms"],
+            recorder.duration_ms,
+        )
+        metrics["over_budget"] += over_budget
+
+
+def get_query_metrics() -> dict[str, dict]:
+    """Возвращает накопленную в текущем процессе статистику запросов
+    к базе по представлениям.
+    """
+    with _metrics_lock:
+        return {
+            view_name: {
+                **metrics,
+                "db_time_ms": round(metrics["db_time_ms"], 2),
+                "avg_queries": round(
+                    metrics["queries"] / metrics["requests"],
+                    2,
+                ),
+            }
+            for view_name, metrics in _metrics.items()
+        }
+
+
+def percentile(latencies: list[float], fraction: float) -> float | None:
+    """Возвращает перцентиль задержек в миллисекундах."""
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    index = min(int(len(ordered) * fraction), len(ordered) - 1)
+    return round(ordered[index] * 1000, 2)
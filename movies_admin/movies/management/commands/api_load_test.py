@@ -0,0 +1,180 @@
+import asyncio
+import json
+import ssl
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.instrumentation import percentile
+
+DEFAULT_PATHS = (
+    "/api/v1/movies/",
+    "/api/v1/genres/",
+)
+
+
+class HTTPClient:
+    """Минимальный HTTP/1.1 клиент c keep-alive соединением."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.ssl = None
+        if parts.scheme == "https":
+            self.ssl = ssl.create_default_context()
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host,
+            self.port,
+            ssl=self.ssl,
+        )
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+    async def get(self, path: str) -> int:
+        """Выполняет GET-запрос и возвращает код ответа."""
+        if self.writer is None:
+            await self.connect()
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            "Connection: keep-alive\r\n\r\n".encode(),
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            await self.reader.read()
+            await self.close()
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+
+async def run_level(
+        url: str,
+        path: str,
+        concurrency: int,
+        total_requests: int,
+) -> dict:
+    """Нагружает путь заданным числом одновременных соединений."""
+    latencies = []
+    errors = 0
+    remaining = total_requests
+
+    async def worker():
+        nonlocal errors, remaining
+        client = HTTPClient(url)
+        try:
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    status = await client.get(path)
+                except (
+                    OSError,
+                    ValueError,
+                    IndexError,
+                    asyncio.IncompleteReadError,
+                ):
+                    errors += 1
+                    await client.close()
+                    continue
+                latencies.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors += 1
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "path": path,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0,
+        "p50_ms": percentile(latencies, 0.5),
+        "p95_ms": percentile(latencies, 0.95),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагружает запущенный сервер запросами к API каталога и выводит "
+        "пропускную способность и задержки в формате JSON. "
+        "Запустите команду против WSGI- и ASGI-сервера и сравните "
+        "результаты."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000",
+            help="Адрес запущенного сервера.",
+        )
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=DEFAULT_PATHS,
+            help="Пути, которые нагружаются по очереди.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            nargs="+",
+            type=int,
+            default=(10, 100, 1000),
+            help="Числа одновременных соединений.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=5000,
+            help="Количество запросов на каждый уровень нагрузки.",
+        )
+        parser.add_argument(
+            "--label",
+            default="",
+            help="Метка запуска, например wsgi или asgi.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        if urlsplit(options["url"]).scheme not in ("http", "https"):
+            raise CommandError("Поддерживаются только адреса http и https")
+
+        results = [
+            asyncio.run(
+                run_level(
+                    options["url"],
+                    path,
+                    concurrency,
+                    options["requests"],
+                ),
+            )
+            for path in options["paths"]
+            for concurrency in options["concurrency"]
+        ]
+        self.stdout.write(
+            json.dumps(
+                {"label": options["label"], "results": results},
+                indent=2,
+            ),
+        )
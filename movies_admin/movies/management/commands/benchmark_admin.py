@@ -0,0 +1,144 @@
+import json
+import statistics
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from movies.instrumentation import QueryRecorder, percentile
+from movies.models import FilmWork, Person, PersonFilmWork
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет задержки и количество запросов к базе для страниц "
+        "панели администратора и API каталога и выводит результат "
+        "в формате JSON."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--search",
+            default=None,
+            help="Строка поиска. По умолчанию берётся из данных.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=None,
+            help="Файл для сохранения результатов.",
+        )
+        parser.add_argument("--label", default="")
+
+    def get_scenarios(self, search: str | None) -> dict[str, str]:
+        """Возвращает адреса замеряемых страниц."""
+        film_work = FilmWork.objects.order_by("pk").first()
+        person = Person.objects.order_by("pk").first()
+        search = search or (person.full_name.split()[0] if person else "a")
+        autocomplete_query = urlencode(
+            {
+                "app_label": PersonFilmWork._meta.app_label,
+                "model_name": PersonFilmWork._meta.model_name,
+                "field_name": "person",
+                "term": search,
+            },
+        )
+        scenarios = {
+            "film_work_changelist": reverse(
+                "admin:movies_filmwork_changelist",
+            ),
+            "film_work_changelist_search": (
+                f"{reverse('admin:movies_filmwork_changelist')}"
+                f"?{urlencode({'q': search})}"
+            ),
+            "film_work_changelist_filter": (
+                f"{reverse('admin:movies_filmwork_changelist')}"
+                "?type__exact=tv_show"
+            ),
+            "person_changelist": reverse("admin:movies_person_changelist"),
+            "person_changelist_search": (
+                f"{reverse('admin:movies_person_changelist')}"
+                f"?{urlencode({'q': search})}"
+            ),
+            "person_autocomplete": (
+                f"{reverse('admin:autocomplete')}?{autocomplete_query}"
+            ),
+            "api_film_work_list": reverse("api:film_work_list"),
+        }
+        if film_work is not None:
+            scenarios["film_work_change_form"] = reverse(
+                "admin:movies_filmwork_change",
+                args=(film_work.pk,),
+            )
+            scenarios["api_film_work_detail"] = reverse(
+                "api:film_work_detail",
+                args=(film_work.pk,),
+            )
+        return scenarios
+
+    def measure(self, client: Client, url: str, iterations: int) -> dict:
+        """Запрашивает страницу несколько раз после прогрева."""
+        client.get(url)
+        latencies = []
+        query_counts = []
+        status_codes = set()
+        for _ in range(iterations):
+            recorder = QueryRecorder()
+            with connections["default"].execute_wrapper(recorder):
+                started = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - started)
+            query_counts.append(recorder.count)
+            status_codes.add(response.status_code)
+        return {
+            "url": url,
+            "status_codes": sorted(status_codes),
+            "p50_ms": percentile(latencies, 0.5),
+            "p95_ms": percentile(latencies, 0.95),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+            "queries": max(query_counts),
+        }
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_superuser(
+                    username=f"benchmark-{uuid.uuid4()}",
+                    password=None,
+                )
+                client = Client()
+                client.force_login(user)
+                results = {
+                    name: self.measure(client, url, options["iterations"])
+                    for name, url in self.get_scenarios(
+                        options["search"],
+                    ).items()
+                }
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        report = json.dumps(
+            {
+                "label": options["label"],
+                "films": FilmWork.objects.count(),
+                "iterations": options["iterations"],
+                "results": results,
+            },
+            indent=2,
+        )
+        if options["output"]:
+            options["output"].write_text(report)
+        self.stdout.write(report)
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from movies.instrumentation import percentile
+
+from .api_load_test import run_level
+
+CONNECTION_COUNT_SQL = (
+    "SELECT count(*) FROM pg_stat_activity "
+    "WHERE datname = current_database() "
+    "AND backend_type = 'client backend'"
+)
+SAMPLE_INTERVAL = 0.1
+
+
+def count_connections(alias: str) -> int:
+    """Возвращает число клиентских соединений c базой."""
+    with connections[alias].cursor() as cursor:
+        cursor.execute(CONNECTION_COUNT_SQL)
+        return cursor.fetchone()[0]
+
+
+class ConnectionSampler(threading.Thread):
+    """Опрашивает pg_stat_activity из отдельного потока и запоминает
+    наибольшее число соединений c базой за время нагрузки.
+    """
+
+    def __init__(self, alias: str):
+        super().__init__(daemon=True)
+        self.alias = alias
+        self.stopped = threading.Event()
+        self.peak = 0
+
+    def run(self):
+        try:
+            while not self.stopped.wait(SAMPLE_INTERVAL):
+                self.peak = max(self.peak, count_connections(self.alias))
+        finally:
+            connections[self.alias].close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время запроса c открытием нового соединения "
+        "и через постоянное соединение к базе. C параметром --url "
+        "нагружает запущенный WSGI- или ASGI-сервер и показывает, "
+        "сколько соединений c базой он открывает."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Псевдоним проверяемой базы данных.",
+        )
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="Адрес запущенного сервера, например http://127.0.0.1:8000.",
+        )
+        parser.add_argument(
+            "--path",
+            default="/api/v1/movies/",
+            help="Путь, который нагружается на сервере.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=100,
+            help="Число одновременных соединений c сервером.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Количество запросов к серверу.",
+        )
+        parser.add_argument(
+            "--label",
+            default="",
+            help="Метка сервера, например wsgi или asgi.",
+        )
+
+    def measure(self, alias: str, iterations: int, reconnect: bool) -> dict:
+        """Выполняет ``SELECT 1``, при необходимости переоткрывая
+        соединение перед каждым запросом, как без ``CONN_MAX_AGE``.
+        """
+        connection = connections[alias]
+        latencies = []
+        for _ in range(iterations):
+            if reconnect:
+                connection.close()
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            latencies.append(time.perf_counter() - started)
+        return {
+            "p50_ms": percentile(latencies, 0.5),
+            "p95_ms": percentile(latencies, 0.95),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        }
+
+    def measure_server(
+            self,
+            alias: str,
+            url: str,
+            path: str,
+            concurrency: int,
+            requests: int,
+    ) -> dict:
+        """Нагружает сервер и считает соединения c базой до нагрузки,
+        в её пике и после неё. Соединения, оставшиеся после нагрузки,
+        держат потоки сервера.
+        """
+        before = count_connections(alias)
+        sampler = ConnectionSampler(alias)
+        sampler.start()
+        try:
+            load = asyncio.run(run_level(url, path, concurrency, requests))
+        finally:
+            sampler.stopped.set()
+            sampler.join()
+        return {
+            **load,
+            "connections_before": before,
+            "connections_peak": max(sampler.peak, before),
+            "connections_after": count_connections(alias),
+        }
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        alias = options["database"]
+        iterations = options["iterations"]
+        fresh = self.measure(alias, iterations, reconnect=True)
+        persistent = self.measure(alias, iterations, reconnect=False)
+        server = None
+        if options["url"]:
+            if urlsplit(options["url"]).scheme not in ("http", "https"):
+                raise CommandError(
+                    "Поддерживаются только адреса http и https",
+                )
+            server = {
+                "url": options["url"],
+                "label": options["label"],
+                **self.measure_server(
+                    alias,
+                    options["url"],
+                    options["path"],
+                    options["concurrency"],
+                    options["requests"],
+                ),
+            }
+        self.stdout.write(
+            json.dumps(
+                {
+                    "database": alias,
+                    "conn_max_age": connections[alias].settings_dict[
+                        "CONN_MAX_AGE"
+                    ],
+                    "iterations": iterations,
+                    "new_connection": fresh,
+                    "persistent_connection": persistent,
+                    "overhead_per_request_ms": round(
+                        fresh["mean_ms"] - persistent["mean_ms"],
+                        3,
+                    ),
+                    "server": server,
+                },
+                indent=2,
+            ),
+        )
@@ -0,0 +1,82 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from movies.instrumentation import percentile
+from movies.models import GenreFilmWork, PersonFilmWork
+
+LOOKUPS = {
+    "person_film_work_by_film_work": (PersonFilmWork, "film_work_id"),
+    "person_film_work_by_person": (PersonFilmWork, "person_id"),
+    "genre_film_work_by_film_work": (GenreFilmWork, "film_work_id"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет время выборок и обслуживания таблиц связей. "
+        "Запустите до и после секционирования и сравните результаты."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--samples", type=int, default=500)
+        parser.add_argument(
+            "--skip-maintenance",
+            action="store_true",
+            help="Не замерять VACUUM и REINDEX.",
+        )
+        parser.add_argument("--label", default="")
+
+    def sample_values(self, model: type, column: str, count: int) -> list:
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {column} FROM {table} "  # noqa: S608
+                "ORDER BY random() LIMIT %s",
+                [count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def measure_lookups(self, samples: int) -> dict:
+        results = {}
+        for name, (model, column) in LOOKUPS.items():
+            latencies = []
+            for value in self.sample_values(model, column, samples):
+                started = time.perf_counter()
+                list(
+                    model.objects
+                    .filter(**{column: value})
+                    .values_list("id", flat=True),
+                )
+                latencies.append(time.perf_counter() - started)
+            results[name] = {
+                "samples": len(latencies),
+                "p50_ms": percentile(latencies, 0.5),
+                "p95_ms": percentile(latencies, 0.95),
+            }
+        return results
+
+    def measure_maintenance(self) -> dict:
+        results = {}
+        for model in (PersonFilmWork, GenreFilmWork):
+            table = connection.ops.quote_name(model._meta.db_table)
+            for operation in ("VACUUM (ANALYZE)", "REINDEX TABLE"):
+                started = time.perf_counter()
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{operation} {table}")
+                results[f"{operation} {model._meta.model_name}"] = round(
+                    (time.perf_counter() - started) * 1000,
+                    2,
+                )
+        return results
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        report = {
+            "label": options["label"],
+            "lookups": self.measure_lookups(options["samples"]),
+        }
+        if not options["skip_maintenance"]:
+            report["maintenance_ms"] = self.measure_maintenance()
+        self.stdout.write(json.dumps(report, indent=2))
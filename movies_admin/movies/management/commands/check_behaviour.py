@@ -0,0 +1,55 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from movies.tests import (
+    TestCacheInvalidation,
+    TestCatalogueStats,
+    TestConditionalResponses,
+    TestExportFirstRow,
+    TestFilmWorkActions,
+    TestFilmWorkOutbox,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Проверяет поведение панели администратора и каталога "
+        "во временной транзакции, которая затем откатывается. "
+        "Время до первой строки выгрузки замеряется вне транзакции."
+    )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        setup_test_environment()
+        try:
+            try:
+                TestExportFirstRow()()
+            except AssertionError as exc:
+                raise CommandError(str(exc)) from exc
+            with transaction.atomic():
+                user = get_user_model().objects.create_superuser(
+                    username=f"behaviour-check-{uuid.uuid4()}",
+                    password=None,
+                )
+                client = Client()
+                client.force_login(user)
+                try:
+                    TestFilmWorkActions(client)()
+                    TestConditionalResponses(client)()
+                    TestCacheInvalidation(client)()
+                    TestFilmWorkOutbox()()
+                    TestCatalogueStats()()
+                except AssertionError as exc:
+                    raise CommandError(str(exc)) from exc
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(self.style.SUCCESS("Behaviour checks passed"))
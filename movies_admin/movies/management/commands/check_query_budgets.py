@@ -0,0 +1,41 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from movies.tests import TestAdminQueryBudgets
+
+
+class Command(BaseCommand):
+    help = (
+        "Проверяет, что страницы панели администратора укладываются "
+        "в бюджет запросов к базе."
+    )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_superuser(
+                    username=f"query-budget-{uuid.uuid4()}",
+                    password=None,
+                )
+                client = Client()
+                client.force_login(user)
+                try:
+                    TestAdminQueryBudgets(client)()
+                except AssertionError as exc:
+                    raise CommandError(str(exc)) from exc
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(
+            self.style.SUCCESS("Admin pages are within query budgets"),
+        )
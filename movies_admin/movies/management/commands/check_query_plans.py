@@ -0,0 +1,118 @@
+import random
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from movies.models import (
+    FilmWork,
+    FilmWorkType,
+    Genre,
+    GenreFilmWork,
+    Person,
+    PersonFilmWork,
+)
+from movies.tests import TestQueryPlans
+
+SEED_FILM_COUNT = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        "Проверяет через EXPLAIN, что ключевые запросы панели "
+        "администратора используют индексы."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=SEED_FILM_COUNT,
+            help=(
+                "Количество фильмов, создаваемых во временной транзакции "
+                "перед проверкой. При 0 проверяются уже загруженные данные."
+            ),
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Выводит планы всех проверенных запросов.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        test_query_plans = TestQueryPlans()
+        with transaction.atomic():
+            if options["seed"]:
+                self.seed(options["seed"])
+            try:
+                test_query_plans()
+            except AssertionError as exc:
+                raise CommandError(str(exc)) from exc
+            finally:
+                if options["verbose_plans"]:
+                    for name, plan in test_query_plans.plans.items():
+                        self.stdout.write(f"{name}:\n{plan}\n")
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(test_query_plans.plans)} query plans use indexes",
+            ),
+        )
+
+    def seed(self, film_count: int):
+        """Заполняет таблицы случайными данными и обновляет
+        статистику планировщика.
+        """
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"genre {uuid.uuid4()}") for _ in range(20)
+        )
+        persons = Person.objects.bulk_create(
+            (
+                Person(full_name=f"person {uuid.uuid4()}")
+                for _ in range(film_count)
+            ),
+            batch_size=1000,
+        )
+        film_works = FilmWork.objects.bulk_create(
+            (
+                FilmWork(
+                    title=f"film {uuid.uuid4()}",
+                    rating=round(random.uniform(0, 10), 1),  # noqa: S311
+                    type=random.choice(FilmWorkType.values),  # noqa: S311
+                )
+                for _ in range(film_count)
+            ),
+            batch_size=1000,
+        )
+        GenreFilmWork.objects.bulk_create(
+            (
+                GenreFilmWork(
+                    film_work=film_work,
+                    genre=random.choice(genres),  # noqa: S311
+                )
+                for film_work in film_works
+            ),
+            batch_size=1000,
+        )
+        PersonFilmWork.objects.bulk_create(
+            (
+                PersonFilmWork(
+                    film_work=film_work,
+                    person=random.choice(persons),  # noqa: S311
+                )
+                for film_work in film_works
+                for _ in range(5)
+            ),
+            batch_size=1000,
+        )
+        with connection.cursor() as cursor:
+            for model in (
+                FilmWork,
+                Genre,
+                Person,
+                GenreFilmWork,
+                PersonFilmWork,
+            ):
+                table = connection.ops.quote_name(model._meta.db_table)
+                cursor.execute(f"ANALYZE {table}")
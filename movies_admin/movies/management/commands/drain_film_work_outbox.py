@@ -0,0 +1,37 @@
+import json
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from movies.outbox import OUTBOX_BATCH_SIZE, drain_film_work_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Выводит идентификаторы изменённых фильмов из очереди изменений "
+        "по одной пачке в строке в формате JSON и удаляет их из очереди."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Наибольшее количество пачек. По умолчанию вся очередь.",
+        )
+
+    def write_batch(self, film_work_ids: list[uuid.UUID]):
+        self.stdout.write(json.dumps([str(pk) for pk in film_work_ids]))
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        processed = drain_film_work_changes(
+            self.write_batch,
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stderr.write(f"Drained {processed} film work changes")
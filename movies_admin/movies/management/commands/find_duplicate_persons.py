@@ -0,0 +1,318 @@
+import csv
+import os
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import groupby
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from movies.cache import bump_version, invalidate_film_works
+from movies.dedup import (
+    PersonRow,
+    find_duplicates,
+    make_name_block,
+    normalize_name,
+)
+from movies.models import Person, PersonFilmWork
+from movies.utils import iter_batches
+
+CSV_FIELDS = (
+    "keep_id",
+    "keep_name",
+    "keep_film_count",
+    "duplicate_id",
+    "duplicate_name",
+    "duplicate_film_count",
+    "score",
+)
+PERSONS_PER_TASK = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Ищет дубли персон по похожим именам. Имена сравниваются только "
+        "внутри блоков c одинаковым фонетическим ключом, в нескольких "
+        "процессах. Результат выводится в формате CSV; c параметром "
+        "--merge дубли из CSV-файла объединяются."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument(
+            "--rebuild-blocks",
+            action="store_true",
+            help="Пересчитывает ключи блокировки всех персон.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.9,
+            help="Наименьшая похожесть имён от 0 до 1.",
+        )
+        parser.add_argument(
+            "--max-block-size",
+            type=int,
+            default=2000,
+            help=(
+                "Наибольшее число различных имён в блоке. В блоках "
+                "c большим числом имён ищутся только точные совпадения."
+            ),
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=None,
+            help="Файл для сохранения кандидатов.",
+        )
+        parser.add_argument(
+            "--merge",
+            type=Path,
+            default=None,
+            help="CSV-файл c кандидатами, которые нужно объединить.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        self.batch_size = options["batch_size"]
+        if options["merge"]:
+            self.merge(options["merge"])
+            return
+
+        self.build_blocks(rebuild=options["rebuild_blocks"])
+        pairs = self.iter_candidates(
+            self.iter_blocks(options["max_block_size"]),
+            options["workers"],
+            options["threshold"],
+        )
+        if options["output"]:
+            with options["output"].open("w", newline="") as output:
+                found = self.write_candidates(output, pairs)
+        else:
+            found = self.write_candidates(self.stdout, pairs)
+        self.stderr.write(f"Found {found} duplicate candidates")
+
+    def build_blocks(self, rebuild: bool):
+        """Заполняет ключи блокировки пачками по первичному ключу.
+
+        Без rebuild обрабатываются только персоны без ключа,
+        например загруженные в обход модели.
+        """
+        queryset = Person.objects.order_by("pk")
+        if not rebuild:
+            queryset = queryset.filter(name_block="")
+        table = connection.ops.quote_name(Person._meta.db_table)
+        started = time.monotonic()
+        updated = 0
+        last_pk = None
+        while True:
+            batch_queryset = queryset
+            if last_pk is not None:
+                batch_queryset = batch_queryset.filter(pk__gt=last_pk)
+            rows = list(
+                batch_queryset
+                .values_list("pk", "full_name")[:self.batch_size],
+            )
+            if not rows:
+                break
+            params = []
+            for pk, full_name in rows:
+                params.extend((pk, make_name_block(full_name)))
+            values = ", ".join(["(%s::uuid, %s)"] * len(rows))
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} AS p "  # noqa: S608
+                    "SET name_block = v.block "
+                    f"FROM (VALUES {values}) AS v (id, block) "
+                    "WHERE p.id = v.id",
+                    params,
+                )
+            updated += len(rows)
+            last_pk = rows[-1][0]
+            self.stderr.write(
+                f"Name blocks: {updated} rows "
+                f"({time.monotonic() - started:.1f}s)",
+            )
+
+    def iter_blocks(self, max_block_size: int) -> Iterator[list[PersonRow]]:
+        """Читает персоны в порядке ключа блокировки по индексу
+        и отдаёт блоки, в которых больше одной персоны.
+
+        Персоны c одинаковым нормализованным именем сравниваются
+        без попарного перебора, поэтому размер блока считается
+        по различным именам. Блок, в котором различных имён больше
+        max_block_size, делится на группы одинаковых имён: в нём
+        ищутся только точные совпадения, и он выводится в отчёт.
+        """
+        rows = (
+            Person.objects
+            .exclude(name_block="")
+            .order_by("name_block")
+            .values_list("name_block", "pk", "full_name", "film_count")
+            .iterator(chunk_size=self.batch_size)
+        )
+        skipped = 0
+        for name_block, block_rows in groupby(rows, key=lambda row: row[0]):
+            block = [row[1:] for row in block_rows]
+            if len(block) < 2:
+                continue
+            by_name: dict[str, list[PersonRow]] = {}
+            for person in block:
+                name = normalize_name(person[1])
+                by_name.setdefault(name, []).append(person)
+            if len(by_name) <= max_block_size:
+                yield block
+                continue
+            skipped += 1
+            self.stderr.write(
+                f"Block {name_block!r}: {len(block)} persons, "
+                f"{len(by_name)} distinct names exceed {max_block_size}, "
+                "only exact name matches are compared",
+            )
+            for persons in by_name.values():
+                if len(persons) > 1:
+                    yield persons
+        if skipped:
+            self.stderr.write(
+                f"Compared only exact name matches in {skipped} blocks "
+                f"with more than {max_block_size} distinct names",
+            )
+
+    def iter_candidates(
+            self,
+            blocks: Iterable[list[PersonRow]],
+            workers: int,
+            threshold: float,
+    ) -> Iterator[tuple[PersonRow, PersonRow, float]]:
+        """Сравнивает блоки в дочерних процессах.
+
+        Блоки объединяются в задачи примерно по PERSONS_PER_TASK
+        персон, и в работе одновременно не больше двух задач
+        на процесс, чтобы не держать в памяти весь справочник.
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for task in self.iter_tasks(blocks):
+                pending.add(executor.submit(find_duplicates, task, threshold))
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            for future in pending:
+                yield from future.result()
+
+    def iter_tasks(
+            self,
+            blocks: Iterable[list[PersonRow]],
+    ) -> Iterator[list[list[PersonRow]]]:
+        task = []
+        size = 0
+        for block in blocks:
+            task.append(block)
+            size += len(block)
+            if size >= PERSONS_PER_TASK:
+                yield task
+                task = []
+                size = 0
+        if task:
+            yield task
+
+    def write_candidates(
+            self,
+            output: object,
+            pairs: Iterable[tuple[PersonRow, PersonRow, float]],
+    ) -> int:
+        writer = csv.writer(output)
+        writer.writerow(CSV_FIELDS)
+        found = 0
+        for keep, duplicate, score in pairs:
+            writer.writerow((*keep, *duplicate, score))
+            found += 1
+        return found
+
+    def read_merges(self, path: Path) -> dict[uuid.UUID, uuid.UUID]:
+        """Читает пары из CSV-файла и сводит цепочки объединений
+        к конечной персоне. Пары, образующие цикл, пропускаются.
+        """
+        with path.open(newline="") as candidates:
+            merges = {
+                uuid.UUID(row["duplicate_id"]): uuid.UUID(row["keep_id"])
+                for row in csv.DictReader(candidates)
+            }
+        resolved = {}
+        for duplicate_id, merge_into in merges.items():
+            keep_id = merge_into
+            seen = {duplicate_id}
+            while keep_id in merges and keep_id not in seen:
+                seen.add(keep_id)
+                keep_id = merges[keep_id]
+            if keep_id not in seen:
+                resolved[duplicate_id] = keep_id
+        return resolved
+
+    def merge(self, path: Path):
+        """Объединяет дубли пачками: переносит их участие в фильмах
+        на основную персону одним UPDATE, удаляет повторившиеся
+        связи и сами дубли.
+        """
+        merges = self.read_merges(path)
+        started = time.monotonic()
+        merged = 0
+        for batch in iter_batches(merges.items(), self.batch_size):
+            with transaction.atomic():
+                film_work_ids = self.merge_batch(batch)
+                transaction.on_commit(
+                    partial(invalidate_film_works, film_work_ids),
+                )
+            merged += len(batch)
+            self.stderr.write(
+                f"Merged {merged}/{len(merges)} persons "
+                f"({time.monotonic() - started:.1f}s)",
+            )
+        transaction.on_commit(partial(bump_version, Person))
+        self.stdout.write(
+            self.style.SUCCESS(f"Merged {merged} duplicate persons"),
+        )
+
+    def merge_batch(
+            self,
+            batch: list[tuple[uuid.UUID, uuid.UUID]],
+    ) -> set[uuid.UUID]:
+        credits_table = connection.ops.quote_name(
+            PersonFilmWork._meta.db_table,
+        )
+        persons_table = connection.ops.quote_name(Person._meta.db_table)
+        duplicate_ids = [duplicate_id for duplicate_id, _ in batch]
+        keep_ids = list({keep_id for _, keep_id in batch})
+        values = ", ".join(["(%s::uuid, %s::uuid)"] * len(batch))
+        params = [pk for pair in batch for pk in pair]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {credits_table} AS pfw "  # noqa: S608
+                "SET person_id = m.keep_id "
+                f"FROM (VALUES {values}) AS m (duplicate_id, keep_id) "
+                "WHERE pfw.person_id = m.duplicate_id "
+                "RETURNING pfw.film_work_id",
+                params,
+            )
+            film_work_ids = {row[0] for row in cursor.fetchall()}
+            cursor.execute(
+                f"DELETE FROM {credits_table} AS a "  # noqa: S608
+                f"USING {credits_table} AS b "
+                "WHERE a.person_id = ANY(%s::uuid[]) "
+                "AND b.person_id = a.person_id "
+                "AND b.film_work_id = a.film_work_id "
+                "AND b.role = a.role "
+                "AND b.id < a.id",
+                [keep_ids],
+            )
+            cursor.execute(
+                f"DELETE FROM {persons_table} "  # noqa: S608
+                "WHERE id = ANY(%s::uuid[])",
+                [duplicate_ids],
+            )
+        return film_work_ids
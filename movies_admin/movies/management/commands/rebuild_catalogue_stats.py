@@ -0,0 +1,32 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from movies.statistics import rebuild_catalogue_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает таблицу статистики каталога по всем фильмам. "
+        "Во время пересчёта изменение фильмов блокируется."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument(
+            "--with-film-counts",
+            action="store_true",
+            help="Также пересчитывает количество фильмов жанров и персон.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        started = time.monotonic()
+        rebuild_catalogue_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Catalogue statistics rebuilt in "
+                f"{time.monotonic() - started:.2f}s",
+            ),
+        )
+        if options["with_film_counts"]:
+            call_command("recount_film_counts")
@@ -0,0 +1,82 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from movies.models import Genre, GenreFilmWork, Person, PersonFilmWork
+
+COUNTERS = {
+    Genre: (GenreFilmWork, "genre"),
+    Person: (PersonFilmWork, "person"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает количество фильмов у жанров и персон пачками. "
+        "Нужен после TRUNCATE таблиц связей или загрузки данных "
+        "c отключёнными триггерами."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        for model, (link_model, field_name) in COUNTERS.items():
+            self.recount(
+                model,
+                link_model,
+                field_name,
+                options["batch_size"],
+            )
+
+    def recount(
+            self,
+            model: type[models.Model],
+            link_model: type[models.Model],
+            field_name: str,
+            batch_size: int,
+    ):
+        """Обновляет film_count по диапазонам первичного ключа,
+        чтобы не блокировать всю таблицу одной транзакцией.
+        """
+        film_count = Coalesce(
+            Subquery(
+                link_model.objects
+                .filter(**{field_name: OuterRef("pk")})
+                .order_by()
+                .values(field_name)
+                .annotate(total=Count("id"))
+                .values("total"),
+            ),
+            0,
+        )
+        table = connection.ops.quote_name(model._meta.db_table)
+        started = time.monotonic()
+        updated = 0
+        last_pk = None
+        while True:
+            queryset = model.objects.order_by("pk")
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            with transaction.atomic():
+                model.objects.filter(pk__in=pks).update(
+                    film_count=film_count,
+                )
+            updated += len(pks)
+            last_pk = pks[-1]
+            self.stdout.write(
+                f"{table}: {updated} rows "
+                f"({time.monotonic() - started:.1f}s)",
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{table}: film counts recomputed "
+                f"for {updated} rows",
+            ),
+        )
@@ -0,0 +1,33 @@
+import time
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from movies.cache import bump_version
+from movies.models import FilmWorkCatalog
+
+
+class Command(BaseCommand):
+    help = "Обновляет материализованное представление каталога фильмов."
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument(
+            "--blocking",
+            action="store_true",
+            help=(
+                "Обновляет представление c блокировкой чтения. "
+                "Необходимо, если представление ещё не заполнено."
+            ),
+        )
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        started = time.monotonic()
+        FilmWorkCatalog.refresh(concurrently=not options["blocking"])
+        transaction.on_commit(partial(bump_version, FilmWorkCatalog))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Film work catalog refreshed in "
+                f"{time.monotonic() - started:.2f}s",
+            ),
+        )
@@ -0,0 +1,231 @@
+import csv
+import datetime as dt
+import io
+import random
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.utils import timezone
+from faker import Faker
+
+from movies.dedup import make_name_block
+from movies.models import (
+    FilmWork,
+    FilmWorkType,
+    Genre,
+    GenreFilmWork,
+    Person,
+    PersonFilmWork,
+    PersonRole,
+)
+from movies.utils import iter_batches
+
+NAME_POOL_SIZE = 2000
+TEXT_POOL_SIZE = 500
+ROLE_WEIGHTS = {
+    PersonRole.ACTOR: 8,
+    PersonRole.DIRECTOR: 1,
+    PersonRole.WRITER: 1,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет каталог случайными фильмами, жанрами, персонами "
+        "и связями между ними для нагрузочного тестирования."
+    )
+
+    def add_arguments(self, parser):  # noqa: ANN001
+        parser.add_argument("--films", type=int, default=10_000)
+        parser.add_argument("--persons", type=int, default=None)
+        parser.add_argument("--genres", type=int, default=30)
+        parser.add_argument(
+            "--credits-per-film",
+            type=int,
+            default=20,
+            help="Среднее количество персон фильма.",
+        )
+        parser.add_argument(
+            "--genres-per-film",
+            type=int,
+            default=3,
+            help="Наибольшее количество жанров фильма.",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Загружает данные через COPY вместо bulk_create.",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):  # noqa: ANN002, ANN003
+        self.random = random.Random(options["seed"])  # noqa: S311
+        self.faker = Faker()
+        self.faker.seed_instance(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.use_copy = options["copy"]
+        self.now = timezone.now()
+
+        films = options["films"]
+        persons = options["persons"] or max(films // 2, 1)
+
+        genre_ids = self.load(Genre, self.iter_genres(options["genres"]))
+        person_ids = self.load(Person, self.iter_persons(persons))
+        film_work_ids = self.load(FilmWork, self.iter_film_works(films))
+        self.load(
+            GenreFilmWork,
+            self.iter_genre_film_works(
+                film_work_ids,
+                genre_ids,
+                options["genres_per_film"],
+            ),
+            keep_ids=False,
+        )
+        self.load(
+            PersonFilmWork,
+            self.iter_person_film_works(
+                film_work_ids,
+                person_ids,
+                options["credits_per_film"],
+            ),
+            keep_ids=False,
+        )
+
+    def load(
+            self,
+            model: type[models.Model],
+            rows: Iterable[dict],
+            keep_ids: bool = True,
+    ) -> list[uuid.UUID]:
+        """Загружает строки пачками и возвращает их идентификаторы."""
+        ids = []
+        loaded = 0
+        table = connection.ops.quote_name(model._meta.db_table)
+        started = time.monotonic()
+        for batch in iter_batches(rows, self.batch_size):
+            with transaction.atomic():
+                if self.use_copy:
+                    self.copy(model, batch)
+                else:
+                    model.objects.bulk_create(model(**row) for row in batch)
+            if keep_ids:
+                ids.extend(row["id"] for row in batch)
+            loaded += len(batch)
+            self.stdout.write(
+                f"{table}: {loaded} rows "
+                f"({time.monotonic() - started:.1f}s)",
+            )
+        return ids
+
+    def copy(self, model: type[models.Model], batch: list[dict]):
+        columns = list(batch[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow(
+                r"\N" if row[column] is None else row[column]
+                for column in columns
+            )
+        buffer.seek(0)
+
+        table = connection.ops.quote_name(model._meta.db_table)
+        column_names = ", ".join(
+            connection.ops.quote_name(model._meta.get_field(column).column)
+            for column in columns
+        )
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table} ({column_names}) FROM STDIN "
+                r"WITH (FORMAT csv, NULL '\N')",
+                buffer,
+            )
+
+    def pool(self, factory: str, size: int) -> list[str]:
+        return [getattr(self.faker, factory)() for _ in range(size)]
+
+    def iter_genres(self, count: int) -> Iterator[dict]:
+        for number, word in enumerate(self.pool("word", count), start=1):
+            yield {
+                "id": uuid.uuid4(),
+                "name": f"{word.capitalize()} {number}",
+                "description": self.faker.sentence(),
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def iter_persons(self, count: int) -> Iterator[dict]:
+        first_names = self.pool("first_name", NAME_POOL_SIZE)
+        last_names = self.pool("last_name", NAME_POOL_SIZE)
+        for _ in range(count):
+            full_name = (
+                f"{self.random.choice(first_names)} "
+                f"{self.random.choice(last_names)}"
+            )
+            yield {
+                "id": uuid.uuid4(),
+                "full_name": full_name,
+                "name_block": make_name_block(full_name),
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def iter_film_works(self, count: int) -> Iterator[dict]:
+        titles = self.pool("catch_phrase", TEXT_POOL_SIZE)
+        descriptions = self.pool("paragraph", TEXT_POOL_SIZE)
+        start_date = dt.date(1920, 1, 1)
+        for number in range(count):
+            yield {
+                "id": uuid.uuid4(),
+                "title": f"{self.random.choice(titles)} {number}",
+                "description": self.random.choice(descriptions),
+                "creation_date": start_date + dt.timedelta(
+                    days=self.random.randrange(365 * 105),
+                ),
+                "rating": round(self.random.uniform(0, 10), 1),
+                "type": self.random.choice(FilmWorkType.values),
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def iter_genre_film_works(
+            self,
+            film_work_ids: list[uuid.UUID],
+            genre_ids: list[uuid.UUID],
+            genres_per_film: int,
+    ) -> Iterator[dict]:
+        genres_per_film = min(genres_per_film, len(genre_ids))
+        for film_work_id in film_work_ids:
+            count = self.random.randint(1, genres_per_film)
+            for genre_id in self.random.sample(genre_ids, count):
+                yield {
+                    "id": uuid.uuid4(),
+                    "film_work_id": film_work_id,
+                    "genre_id": genre_id,
+                    "created_at": self.now,
+                }
+
+    def iter_person_film_works(
+            self,
+            film_work_ids: list[uuid.UUID],
+            person_ids: list[uuid.UUID],
+            credits_per_film: int,
+    ) -> Iterator[dict]:
+        roles = list(ROLE_WEIGHTS)
+        weights = list(ROLE_WEIGHTS.values())
+        for film_work_id in film_work_ids:
+            count = self.random.randint(1, credits_per_film * 2 - 1)
+            for person_id in self.random.sample(
+                person_ids,
+                min(count, len(person_ids)),
+            ):
+                yield {
+                    "id": uuid.uuid4(),
+                    "film_work_id": film_work_id,
+                    "person_id": person_id,
+                    "role": self.random.choices(roles, weights)[0],
+                    "created_at": self.now,
+                }
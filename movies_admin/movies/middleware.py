@@ -0,0 +1,147 @@
+import logging
+from collections.abc import Callable
+from contextlib import ExitStack
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.urls import Resolver404, resolve
+
+from .instrumentation import QueryRecorder, record_request
+from .routers import use_replica
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """Считает запросы к базе и их время для каждого запроса
+    и логирует запросы, превысившие бюджет, вместе c самыми медленными
+    SQL-запросами и их длительностью.
+
+    Работает и в синхронном, и в асинхронном режиме, чтобы
+    асинхронные представления не выполнялись в отдельном потоке.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        self.query_budget: int = getattr(settings, "QUERY_BUDGET", 50)
+        self.time_budget_ms: float = getattr(
+            settings,
+            "QUERY_TIME_BUDGET_MS",
+            500,
+        )
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        with self.wrap_connections(recorder):
+            response = self.get_response(request)
+        self.report(request, recorder)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Подключает счётчик к соединениям в потоке, где асинхронный
+        ORM выполняет запросы: соединения Django привязаны к потоку.
+        """
+        recorder = QueryRecorder()
+        stack = await sync_to_async(self.wrap_connections)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.report(request, recorder)
+        return response
+
+    def wrap_connections(self, recorder: QueryRecorder) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def report(self, request: HttpRequest, recorder: QueryRecorder):
+        view_name = (
+            request.resolver_match.view_name
+            if request.resolver_match else "unresolved"
+        )
+        over_budget = (
+            recorder.count > self.query_budget
+            or recorder.duration_ms > self.time_budget_ms
+        )
+        record_request(view_name, recorder, over_budget)
+
+        if over_budget:
+            slowest = recorder.get_slowest()
+            slowest_lines = "".join(
+                f"\n  {query['duration_ms']} ms: {query['sql']}"
+                for query in slowest
+            )
+            logger.warning(
+                f"{request.method} {request.path} ({view_name}) exceeded "
+                f"query budget: {recorder.count} queries, "
+                f"{recorder.duration_ms} ms. Slowest queries:"
+                f"{slowest_lines}",
+                extra={"slowest_queries": slowest},
+            )
+
+
+class ReplicaReadMiddleware:
+    """Разрешает чтение c реплики для GET-запросов к спискам
+    объектов панели администратора и к API каталога.
+
+    Флаг хранится в contextvar, который sync_to_async передаёт
+    в поток асинхронного ORM, поэтому middleware работает в обоих
+    режимах.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.allows_replica(request):
+            return self.get_response(request)
+
+        token = use_replica.set(True)
+        try:
+            return self.get_response(request)
+        finally:
+            use_replica.reset(token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if not self.allows_replica(request):
+            return await self.get_response(request)
+
+        token = use_replica.set(True)
+        try:
+            return await self.get_response(request)
+        finally:
+            use_replica.reset(token)
+
+    def allows_replica(self, request: HttpRequest) -> bool:
+        if request.method not in ("GET", "HEAD"):
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return match.namespace == "api" or (
+            match.namespace == "admin"
+            and match.url_name.endswith("_changelist")
+        )
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.5 on 2026-10-19 08:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('movies', '0002_update_field_names'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='genrefilmwork',
+            name='genre',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='genre_film_works', to='movies.genre', verbose_name='genre'),
+        ),
+        migrations.AlterField(
+            model_name='personfilmwork',
+            name='film_work',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='person_film_works', to='movies.filmwork', verbose_name='film work'),
+        ),
+        migrations.AlterField(
+            model_name='personfilmwork',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='person_film_works', to='movies.person', verbose_name='person'),
+        ),
+        AddIndexConcurrently(
+            model_name='filmwork',
+            index=models.Index(fields=['rating'], name='film_work_rating_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='filmwork',
+            index=models.Index(fields=['type'], name='film_work_type_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='person',
+            index=models.Index(fields=['full_name'], name='person_full_name_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='genrefilmwork',
+            index=models.Index(fields=['genre'], name='genre_film_work_genre_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='personfilmwork',
+            index=models.Index(fields=['film_work'], name='person_film_work_film_work_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='personfilmwork',
+            index=models.Index(fields=['person'], name='person_film_work_person_idx'),
+        ),
+    ]
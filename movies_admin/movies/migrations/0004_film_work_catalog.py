@@ -0,0 +1,96 @@
+# Generated by Django 4.2.5 on 2026-10-19 09:00
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_add_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=('''
+                CREATE MATERIALIZED VIEW "content"."film_work_catalog" AS
+                SELECT
+                    fw.id,
+                    fw.title,
+                    fw.description,
+                    fw.creation_date,
+                    fw.rating,
+                    fw.type,
+                    fw.created_at,
+                    fw.updated_at,
+                    COALESCE(g.genres, '{}') AS genres,
+                    COALESCE(p.actors, '{}') AS actors,
+                    COALESCE(p.directors, '{}') AS directors,
+                    COALESCE(p.writers, '{}') AS writers
+                FROM "content"."film_work" fw
+                LEFT JOIN (
+                    SELECT
+                        gfw.film_work_id,
+                        array_agg(g.name ORDER BY g.name) AS genres
+                    FROM "content"."genre_film_work" gfw
+                    JOIN "content"."genre" g ON g.id = gfw.genre_id
+                    GROUP BY gfw.film_work_id
+                ) g ON g.film_work_id = fw.id
+                LEFT JOIN (
+                    SELECT
+                        pfw.film_work_id,
+                        array_agg(p.full_name ORDER BY p.full_name)
+                            FILTER (WHERE pfw.role = 'actor') AS actors,
+                        array_agg(p.full_name ORDER BY p.full_name)
+                            FILTER (WHERE pfw.role = 'director') AS directors,
+                        array_agg(p.full_name ORDER BY p.full_name)
+                            FILTER (WHERE pfw.role = 'writer') AS writers
+                    FROM "content"."person_film_work" pfw
+                    JOIN "content"."person" p ON p.id = pfw.person_id
+                    GROUP BY pfw.film_work_id
+                ) p ON p.film_work_id = fw.id
+                WITH DATA;
+
+                CREATE UNIQUE INDEX film_work_catalog_id_idx
+                ON "content"."film_work_catalog" (id);
+
+                CREATE INDEX film_work_catalog_title_idx
+                ON "content"."film_work_catalog" (title);
+
+                CREATE INDEX film_work_catalog_rating_idx
+                ON "content"."film_work_catalog" (rating);
+
+                CREATE INDEX film_work_catalog_type_idx
+                ON "content"."film_work_catalog" (type);
+            '''
+            ),
+            reverse_sql=('''
+                DROP MATERIALIZED VIEW IF EXISTS "content"."film_work_catalog";
+            '''
+            ),
+        ),
+        migrations.CreateModel(
+            name='FilmWorkCatalog',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255, verbose_name='name')),
+                ('description', models.TextField(verbose_name='description')),
+                ('creation_date', models.DateField(null=True, verbose_name='release date')),
+                ('rating', models.FloatField(null=True, verbose_name='rating')),
+                ('type', models.CharField(choices=[('movie', 'movie'), ('tv_show', 'tv_show')], max_length=7, verbose_name='type')),
+                ('created_at', models.DateTimeField(verbose_name='creation time')),
+                ('updated_at', models.DateTimeField(verbose_name='modification time')),
+                ('genres', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), size=None, verbose_name='genres')),
+                ('actors', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), size=None, verbose_name='actors')),
+                ('directors', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), size=None, verbose_name='directors')),
+                ('writers', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), size=None, verbose_name='writers')),
+            ],
+            options={
+                'verbose_name': 'film catalogue entry',
+                'verbose_name_plural': 'film catalogue',
+                'db_table': 'content"."film_work_catalog',
+                'ordering': ('title',),
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,167 @@
+# Generated by Django 4.2.5 on 2026-10-19 10:00
+
+from django.db import migrations
+
+PARTITIONS = 16
+
+FILM_WORK_CATALOG_SQL = '''
+    CREATE MATERIALIZED VIEW "content"."film_work_catalog" AS
+    SELECT
+        fw.id,
+        fw.title,
+        fw.description,
+        fw.creation_date,
+        fw.rating,
+        fw.type,
+        fw.created_at,
+        fw.updated_at,
+        COALESCE(g.genres, '{}') AS genres,
+        COALESCE(p.actors, '{}') AS actors,
+        COALESCE(p.directors, '{}') AS directors,
+        COALESCE(p.writers, '{}') AS writers
+    FROM "content"."film_work" fw
+    LEFT JOIN (
+        SELECT
+            gfw.film_work_id,
+            array_agg(g.name ORDER BY g.name) AS genres
+        FROM "content"."genre_film_work" gfw
+        JOIN "content"."genre" g ON g.id = gfw.genre_id
+        GROUP BY gfw.film_work_id
+    ) g ON g.film_work_id = fw.id
+    LEFT JOIN (
+        SELECT
+            pfw.film_work_id,
+            array_agg(p.full_name ORDER BY p.full_name)
+                FILTER (WHERE pfw.role = 'actor') AS actors,
+            array_agg(p.full_name ORDER BY p.full_name)
+                FILTER (WHERE pfw.role = 'director') AS directors,
+            array_agg(p.full_name ORDER BY p.full_name)
+                FILTER (WHERE pfw.role = 'writer') AS writers
+        FROM "content"."person_film_work" pfw
+        JOIN "content"."person" p ON p.id = pfw.person_id
+        GROUP BY pfw.film_work_id
+    ) p ON p.film_work_id = fw.id
+    WITH DATA;
+
+    CREATE UNIQUE INDEX film_work_catalog_id_idx
+    ON "content"."film_work_catalog" (id);
+
+    CREATE INDEX film_work_catalog_title_idx
+    ON "content"."film_work_catalog" (title);
+
+    CREATE INDEX film_work_catalog_rating_idx
+    ON "content"."film_work_catalog" (rating);
+
+    CREATE INDEX film_work_catalog_type_idx
+    ON "content"."film_work_catalog" (type);
+'''
+
+LINK_TABLES = {
+    'person_film_work': {
+        'columns': '''
+            id uuid NOT NULL,
+            created_at timestamp with time zone,
+            role TEXT NOT NULL,
+            person_id uuid NOT NULL
+                REFERENCES "content"."person" (id) ON DELETE CASCADE,
+            film_work_id uuid NOT NULL
+                REFERENCES "content"."film_work" (id) ON DELETE CASCADE
+        ''',
+        'column_names': 'id, created_at, role, person_id, film_work_id',
+        'indexes': '''
+            CREATE INDEX person_film_work_film_work_idx
+            ON "content"."person_film_work" (film_work_id);
+
+            CREATE INDEX person_film_work_person_idx
+            ON "content"."person_film_work" (person_id);
+        ''',
+    },
+    'genre_film_work': {
+        'columns': '''
+            id uuid NOT NULL,
+            created_at timestamp with time zone,
+            genre_id uuid NOT NULL
+                REFERENCES "content"."genre" (id) ON DELETE CASCADE,
+            film_work_id uuid NOT NULL
+                REFERENCES "content"."film_work" (id) ON DELETE CASCADE
+        ''',
+        'column_names': 'id, created_at, genre_id, film_work_id',
+        'indexes': '''
+            CREATE UNIQUE INDEX genre_film_work_idx
+            ON "content"."genre_film_work" (film_work_id, genre_id);
+
+            CREATE INDEX genre_film_work_genre_idx
+            ON "content"."genre_film_work" (genre_id);
+        ''',
+    },
+}
+
+
+def rebuild_table_sql(table, partitioned):
+    """Пересоздаёт таблицу связей c переносом данных: секционированной
+    по хешу film_work_id или обычной.
+
+    Первичный ключ секционированной таблицы обязан включать ключ
+    секционирования, поэтому он становится (id, film_work_id);
+    уникальность id по-прежнему обеспечивается uuid.
+    """
+    spec = LINK_TABLES[table]
+    if partitioned:
+        primary_key = 'PRIMARY KEY (id, film_work_id)'
+        partition_by = 'PARTITION BY HASH (film_work_id)'
+        partitions = ''.join(
+            f'''
+            CREATE TABLE "content"."{table}_p{remainder}"
+            PARTITION OF "content"."{table}_new"
+            FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder});
+            '''
+            for remainder in range(PARTITIONS)
+        )
+    else:
+        primary_key = 'PRIMARY KEY (id)'
+        partition_by = ''
+        partitions = ''
+
+    return f'''
+        CREATE TABLE "content"."{table}_new" (
+            {spec['columns']},
+            CONSTRAINT {table}_new_pkey {primary_key}
+        ) {partition_by};
+        {partitions}
+
+        INSERT INTO "content"."{table}_new" ({spec['column_names']})
+        SELECT {spec['column_names']} FROM "content"."{table}";
+
+        DROP TABLE "content"."{table}";
+
+        ALTER TABLE "content"."{table}_new" RENAME TO "{table}";
+
+        ALTER TABLE "content"."{table}"
+        RENAME CONSTRAINT {table}_new_pkey TO {table}_pkey;
+
+        {spec['indexes']}
+
+        ANALYZE "content"."{table}";
+    '''
+
+
+def migration_sql(partitioned):
+    return ''.join((
+        'DROP MATERIALIZED VIEW IF EXISTS "content"."film_work_catalog";',
+        *(rebuild_table_sql(table, partitioned) for table in LINK_TABLES),
+        FILM_WORK_CATALOG_SQL,
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_film_work_catalog'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=migration_sql(partitioned=True),
+            reverse_sql=migration_sql(partitioned=False),
+        ),
+    ]
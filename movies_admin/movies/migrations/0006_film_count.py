@@ -0,0 +1,121 @@
+# Generated by Django 4.2.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+COUNTERS = {
+    'genre': ('genre_film_work', 'genre_id'),
+    'person': ('person_film_work', 'person_id'),
+}
+
+
+def counter_sql(table, link_table, column):
+    """Создаёт триггеры, которые поддерживают film_count в актуальном
+    состоянии при любых изменениях таблицы связей.
+
+    Триггеры уровня оператора c таблицами переходов срабатывают один
+    раз на INSERT, UPDATE или DELETE и обновляют счётчики одним
+    агрегирующим запросом, поэтому массовая загрузка связей не
+    приводит к обновлению строки на каждую вставленную связь.
+    """
+    function = f'"content"."update_{table}_film_count"'
+    delta_sql = '''
+        UPDATE "content"."{table}" AS t
+        SET film_count = t.film_count {sign} d.delta
+        FROM (
+            SELECT {column}, count(*) AS delta
+            FROM {rows}
+            GROUP BY {column}
+        ) AS d
+        WHERE t.id = d.{column};
+    '''
+    decrement = delta_sql.format(
+        table=table, column=column, sign='-', rows='old_rows',
+    )
+    increment = delta_sql.format(
+        table=table, column=column, sign='+', rows='new_rows',
+    )
+    return f'''
+        ALTER TABLE "content"."{table}" ALTER COLUMN film_count SET DEFAULT 0;
+
+        CREATE FUNCTION {function}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                {decrement}
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                {increment}
+            END IF;
+            RETURN NULL;
+        END
+        $$;
+
+        CREATE TRIGGER {link_table}_film_count_insert
+        AFTER INSERT ON "content"."{link_table}"
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+        CREATE TRIGGER {link_table}_film_count_update
+        AFTER UPDATE ON "content"."{link_table}"
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+        CREATE TRIGGER {link_table}_film_count_delete
+        AFTER DELETE ON "content"."{link_table}"
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+        UPDATE "content"."{table}" AS t
+        SET film_count = d.total
+        FROM (
+            SELECT {column}, count(*) AS total
+            FROM "content"."{link_table}"
+            GROUP BY {column}
+        ) AS d
+        WHERE t.id = d.{column};
+    '''
+
+
+def drop_counter_sql(table, link_table, column):
+    return ''.join(
+        f'''
+        DROP TRIGGER {link_table}_film_count_{event}
+        ON "content"."{link_table}";
+        '''
+        for event in ('insert', 'update', 'delete')
+    ) + f'DROP FUNCTION "content"."update_{table}_film_count"();'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_partition_link_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='genre',
+            name='film_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='film count'),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='film_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='film count'),
+        ),
+        *(
+            migrations.RunSQL(
+                sql=counter_sql(table, link_table, column),
+                reverse_sql=drop_counter_sql(table, link_table, column),
+            )
+            for table, (link_table, column) in COUNTERS.items()
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(fields=['film_count'], name='genre_film_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['film_count'], name='person_film_count_idx'),
+        ),
+    ]
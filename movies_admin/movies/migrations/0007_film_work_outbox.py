@@ -0,0 +1,140 @@
+# Generated by Django 4.2.5 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+ENQUEUE_SQL = '''
+    INSERT INTO "content"."film_work_outbox" (film_work_id, changed_at)
+    SELECT DISTINCT {column}, now() FROM {rows}
+    ON CONFLICT (film_work_id) DO UPDATE SET changed_at = EXCLUDED.changed_at;
+'''
+
+# Таблицы, изменения которых затрагивают фильмы, и столбец
+# c идентификатором фильма в них.
+STATEMENT_TRIGGERS = {
+    'film_work': 'id',
+    'genre_film_work': 'film_work_id',
+    'person_film_work': 'film_work_id',
+}
+
+# Справочники, переименование записи которых меняет данные фильмов.
+ROW_TRIGGERS = {
+    'genre': ('name', 'genre_film_work', 'genre_id'),
+    'person': ('full_name', 'person_film_work', 'person_id'),
+}
+
+
+def statement_trigger_sql(table, column):
+    """Создаёт триггеры уровня оператора, которые ставят в очередь
+    фильмы из таблиц переходов. При обновлении учитываются и старые,
+    и новые строки, на случай переноса связи на другой фильм.
+
+    Таблицы переходов нельзя объявить у триггера на несколько событий,
+    поэтому на каждое событие создаётся отдельный триггер c общей
+    функцией.
+    """
+    function = f'"content"."enqueue_{table}_changes"'
+    old_rows = ENQUEUE_SQL.format(column=column, rows='old_rows')
+    new_rows = ENQUEUE_SQL.format(column=column, rows='new_rows')
+    return f'''
+        CREATE FUNCTION {function}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                {old_rows}
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                {new_rows}
+            END IF;
+            RETURN NULL;
+        END
+        $$;
+
+        CREATE TRIGGER {table}_outbox_insert
+        AFTER INSERT ON "content"."{table}"
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+        CREATE TRIGGER {table}_outbox_update
+        AFTER UPDATE ON "content"."{table}"
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+        CREATE TRIGGER {table}_outbox_delete
+        AFTER DELETE ON "content"."{table}"
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+    '''
+
+
+def row_trigger_sql(table, name_column, link_table, link_column):
+    """Создаёт триггер, который ставит в очередь фильмы справочной
+    записи только при изменении её названия, чтобы обновление
+    счётчика film_count не порождало лишних событий.
+    """
+    function = f'"content"."enqueue_{table}_changes"'
+    return f'''
+        CREATE FUNCTION {function}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO "content"."film_work_outbox" (film_work_id, changed_at)
+            SELECT DISTINCT film_work_id, now()
+            FROM "content"."{link_table}"
+            WHERE {link_column} = NEW.id
+            ON CONFLICT (film_work_id)
+            DO UPDATE SET changed_at = EXCLUDED.changed_at;
+            RETURN NULL;
+        END
+        $$;
+
+        CREATE TRIGGER {table}_outbox_update
+        AFTER UPDATE OF {name_column} ON "content"."{table}"
+        FOR EACH ROW
+        WHEN (OLD.{name_column} IS DISTINCT FROM NEW.{name_column})
+        EXECUTE FUNCTION {function}();
+    '''
+
+
+def drop_trigger_sql(table, events):
+    return ''.join(
+        f'DROP TRIGGER {table}_outbox_{event} ON "content"."{table}";'
+        for event in events
+    ) + f'DROP FUNCTION "content"."enqueue_{table}_changes"();'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_film_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmWorkOutbox',
+            fields=[
+                ('film_work_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('changed_at', models.DateTimeField(verbose_name='modification time')),
+            ],
+            options={
+                'verbose_name': 'film change',
+                'verbose_name_plural': 'film changes',
+                'db_table': 'content"."film_work_outbox',
+                'indexes': [models.Index(fields=['changed_at'], name='film_work_outbox_changed_idx')],
+            },
+        ),
+        *(
+            migrations.RunSQL(
+                sql=statement_trigger_sql(table, column),
+                reverse_sql=drop_trigger_sql(
+                    table, ('insert', 'update', 'delete'),
+                ),
+            )
+            for table, column in STATEMENT_TRIGGERS.items()
+        ),
+        *(
+            migrations.RunSQL(
+                sql=row_trigger_sql(table, *spec),
+                reverse_sql=drop_trigger_sql(table, ('update',)),
+            )
+            for table, spec in ROW_TRIGGERS.items()
+        ),
+    ]
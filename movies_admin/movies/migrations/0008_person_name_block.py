@@ -0,0 +1,29 @@
+# Generated by Django 4.2.5 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_film_work_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='name_block',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16, verbose_name='name block'),
+        ),
+        migrations.RunSQL(
+            sql='''
+                ALTER TABLE "content"."person"
+                ALTER COLUMN name_block SET DEFAULT '';
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['name_block'], name='person_name_block_idx'),
+        ),
+    ]
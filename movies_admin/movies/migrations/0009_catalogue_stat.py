@@ -0,0 +1,151 @@
+# Generated by Django 4.2.5 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+STAT_DELTA_SQL = '''
+    INSERT INTO "content"."catalogue_stat" AS s (kind, key, value)
+    SELECT b.kind, b.key, sum(d.delta)
+    FROM ({deltas}) AS d
+    CROSS JOIN LATERAL "content"."film_work_stat_buckets"(
+        d.rating, d.type, d.creation_date
+    ) AS b
+    GROUP BY b.kind, b.key
+    HAVING sum(d.delta) <> 0
+    ORDER BY b.kind, b.key
+    ON CONFLICT (kind, key) DO UPDATE SET value = s.value + EXCLUDED.value;
+'''
+
+ROWS_DELTA_SQL = '''
+    SELECT rating, type, creation_date, {delta} AS delta FROM {rows}
+'''
+
+# Обновление учитывает только строки, у которых изменились поля
+# корзин, поэтому правка названия или описания фильма не блокирует
+# строки статистики. Корзины, в которых изменения взаимно
+# компенсируются, отсекаются условием HAVING.
+UPDATE_DELTA_SQL = '''
+    SELECT o.rating, o.type, o.creation_date, -1 AS delta
+    FROM old_rows AS o
+    JOIN new_rows AS n ON n.id = o.id
+    WHERE (o.rating, o.type, o.creation_date)
+        IS DISTINCT FROM (n.rating, n.type, n.creation_date)
+    UNION ALL
+    SELECT n.rating, n.type, n.creation_date, 1 AS delta
+    FROM old_rows AS o
+    JOIN new_rows AS n ON n.id = o.id
+    WHERE (o.rating, o.type, o.creation_date)
+        IS DISTINCT FROM (n.rating, n.type, n.creation_date)
+'''
+
+
+def stat_delta_sql(deltas):
+    return STAT_DELTA_SQL.format(deltas=deltas)
+
+
+CATALOGUE_STAT_SQL = f'''
+    CREATE FUNCTION "content"."film_work_stat_buckets"(
+        p_rating double precision,
+        p_type text,
+        p_creation_date date
+    ) RETURNS TABLE (kind text, key text)
+    LANGUAGE sql IMMUTABLE AS $$
+        VALUES
+            (
+                'rating',
+                COALESCE(LEAST(floor(p_rating), 9)::int::text, 'none')
+            ),
+            ('type', p_type),
+            (
+                'year',
+                COALESCE(
+                    extract(year FROM p_creation_date)::int::text,
+                    'none'
+                )
+            )
+    $$;
+
+    CREATE FUNCTION "content"."update_catalogue_stats"() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {stat_delta_sql(ROWS_DELTA_SQL.format(delta=1, rows='new_rows'))}
+        ELSIF TG_OP = 'DELETE' THEN
+            {stat_delta_sql(ROWS_DELTA_SQL.format(delta=-1, rows='old_rows'))}
+        ELSE
+            {stat_delta_sql(UPDATE_DELTA_SQL)}
+        END IF;
+        RETURN NULL;
+    END
+    $$;
+
+    CREATE FUNCTION "content"."rebuild_catalogue_stats"() RETURNS void
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        LOCK TABLE "content"."film_work" IN SHARE MODE;
+        DELETE FROM "content"."catalogue_stat";
+        {stat_delta_sql(
+            ROWS_DELTA_SQL.format(delta=1, rows='"content"."film_work"'),
+        )}
+    END
+    $$;
+
+    CREATE TRIGGER film_work_catalogue_stat_insert
+    AFTER INSERT ON "content"."film_work"
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION "content"."update_catalogue_stats"();
+
+    CREATE TRIGGER film_work_catalogue_stat_update
+    AFTER UPDATE ON "content"."film_work"
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION "content"."update_catalogue_stats"();
+
+    CREATE TRIGGER film_work_catalogue_stat_delete
+    AFTER DELETE ON "content"."film_work"
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION "content"."update_catalogue_stats"();
+
+    SELECT "content"."rebuild_catalogue_stats"();
+'''
+
+DROP_CATALOGUE_STAT_SQL = '''
+    DROP TRIGGER film_work_catalogue_stat_insert ON "content"."film_work";
+    DROP TRIGGER film_work_catalogue_stat_update ON "content"."film_work";
+    DROP TRIGGER film_work_catalogue_stat_delete ON "content"."film_work";
+    DROP FUNCTION "content"."rebuild_catalogue_stats"();
+    DROP FUNCTION "content"."update_catalogue_stats"();
+    DROP FUNCTION "content"."film_work_stat_buckets"(
+        double precision, text, date
+    );
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_person_name_block'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogueStat',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('rating', 'rating'), ('type', 'type'), ('year', 'release year')], max_length=6, verbose_name='kind')),
+                ('key', models.CharField(max_length=32, verbose_name='key')),
+                ('value', models.IntegerField(default=0, verbose_name='film count')),
+            ],
+            options={
+                'verbose_name': 'catalogue statistic',
+                'verbose_name_plural': 'catalogue statistics',
+                'db_table': 'content"."catalogue_stat',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cataloguestat',
+            constraint=models.UniqueConstraint(fields=('kind', 'key'), name='catalogue_stat_kind_key_uniq'),
+        ),
+        migrations.RunSQL(
+            sql=CATALOGUE_STAT_SQL,
+            reverse_sql=DROP_CATALOGUE_STAT_SQL,
+        ),
+    ]
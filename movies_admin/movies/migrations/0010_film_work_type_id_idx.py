@@ -0,0 +1,27 @@
+# Generated by Django 4.2.5 on 2026-10-19 18:00
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('movies', '0009_catalogue_stat'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='filmwork',
+            index=models.Index(fields=['type', 'id'], name='film_work_type_id_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='filmwork',
+            name='film_work_type_idx',
+        ),
+    ]
@@ -1,9 +1,14 @@
 import uuid
 
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.fields import ArrayField
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connection, models
+from django.db.models import OuterRef
 from django.utils.translation import gettext_lazy as _
 
+from .dedup import NAME_BLOCK_LENGTH, make_name_block
+
 
 class FilmWorkType(models.TextChoices):
     MOVIE = "movie", _("movie")
@@ -30,7 +35,29 @@ class UUIDMixin(models.Model):
         abstract = True
 
 
-class Genre(UUIDMixin, TimeStampedMixin):
+class FilmCountMixin(models.Model):
+    film_count = models.PositiveIntegerField(
+        _("film count"),
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):  # noqa: ANN002, ANN003
+        """Сохраняет объект, не перезаписывая счётчик фильмов,
+        который поддерживают триггеры базы данных.
+        """
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "film_count"
+            ]
+        super().save(*args, **kwargs)
+
+
+class Genre(UUIDMixin, TimeStampedMixin, FilmCountMixin):
     name = models.CharField(_("name"), max_length=255)
     description = models.TextField(_("description"), blank=True)
 
@@ -38,22 +65,79 @@ class Genre(UUIDMixin, TimeStampedMixin):
         db_table = "content\".\"genre"  # noqa: Q003
         verbose_name = _("genre")
         verbose_name_plural = _("genres")
+        indexes = (
+            models.Index(fields=("film_count",), name="genre_film_count_idx"),
+        )
 
     def __str__(self):
         return self.name
 
-class Person(UUIDMixin, TimeStampedMixin):
+class Person(UUIDMixin, TimeStampedMixin, FilmCountMixin):
     full_name = models.CharField(_("full_name"), max_length=255)
+    name_block = models.CharField(
+        _("name block"),
+        max_length=NAME_BLOCK_LENGTH,
+        blank=True,
+        default="",
+        editable=False,
+    )
 
     class Meta:
         db_table = "content\".\"person"  # noqa: Q003
         verbose_name = _("person")
         verbose_name_plural = _("persons")
         ordering = ("full_name", )
+        indexes = (
+            models.Index(fields=("full_name",), name="person_full_name_idx"),
+            models.Index(
+                fields=("film_count",),
+                name="person_film_count_idx",
+            ),
+            models.Index(
+                fields=("name_block",),
+                name="person_name_block_idx",
+            ),
+        )
 
     def __str__(self):
         return self.full_name
 
+    def save(self, *args, **kwargs):  # noqa: ANN002, ANN003
+        self.name_block = make_name_block(self.full_name)
+        super().save(*args, **kwargs)
+
+
+class FilmWorkQuerySet(models.QuerySet):
+
+    def with_credits(self) -> "FilmWorkQuerySet":
+        """Добавляет к фильмам массивы названий жанров и имён персон
+        по ролям.
+
+        Массивы собираются коррелированными подзапросами по индексам
+        таблиц связей, поэтому строки отдаются без сортировки
+        и группировки всего каталога.
+        """
+        genres = (
+            GenreFilmWork.objects
+            .filter(film_work=OuterRef("pk"))
+            .order_by("genre__name")
+            .values("genre__name")
+        )
+        persons = (
+            PersonFilmWork.objects
+            .filter(film_work=OuterRef("pk"))
+            .order_by("person__full_name")
+            .values("person__full_name")
+        )
+        return self.annotate(
+            genre_names=ArraySubquery(genres),
+            actor_names=ArraySubquery(persons.filter(role=PersonRole.ACTOR)),
+            director_names=ArraySubquery(
+                persons.filter(role=PersonRole.DIRECTOR),
+            ),
+            writer_names=ArraySubquery(persons.filter(role=PersonRole.WRITER)),
+        )
+
 
 class FilmWork(UUIDMixin, TimeStampedMixin):
     title = models.CharField(_("name"), max_length=255)
@@ -94,10 +178,20 @@ class FilmWork(UUIDMixin, TimeStampedMixin):
         related_name="film_works",
     )
 
+    objects = FilmWorkQuerySet.as_manager()
+
     class Meta:
         db_table = "content\".\"film_work"  # noqa: Q003
         verbose_name = _("film work")
         verbose_name_plural = _("film works")
+        indexes = (
+            models.Index(fields=("rating",), name="film_work_rating_idx"),
+            # Индекс только по типу планировщик не выбирает: у столбца
+            # два значения. Составной индекс отдаёт отфильтрованный
+            # по типу список в порядке списка фильмов (-pk) без
+            # сортировки.
+            models.Index(fields=("type", "id"), name="film_work_type_id_idx"),
+        )
 
     def __str__(self):
         return self.title
@@ -115,6 +209,7 @@ class GenreFilmWork(UUIDMixin, TimeStampedMixin):
         on_delete=models.CASCADE,
         related_name="genre_film_works",
         verbose_name=_("genre"),
+        db_index=False,
     )
 
     updated_at = None
@@ -124,6 +219,9 @@ class GenreFilmWork(UUIDMixin, TimeStampedMixin):
         verbose_name = _("film genre")
         verbose_name_plural = _("film genres")
         unique_together = ("genre", "film_work")
+        indexes = (
+            models.Index(fields=("genre",), name="genre_film_work_genre_idx"),
+        )
 
     def __str__(self):
         return _(
@@ -140,12 +238,14 @@ class PersonFilmWork(UUIDMixin, TimeStampedMixin):
         on_delete=models.CASCADE,
         related_name="person_film_works",
         verbose_name=_("film work"),
+        db_index=False,
     )
     person = models.ForeignKey(
         Person,
         on_delete=models.CASCADE,
         related_name="person_film_works",
         verbose_name=_("person"),
+        db_index=False,
     )
     role = models.CharField(
         _("role"),
@@ -160,6 +260,16 @@ class PersonFilmWork(UUIDMixin, TimeStampedMixin):
         db_table = "content\".\"person_film_work" # noqa: Q003
         verbose_name = _("film person")
         verbose_name_plural = _("film pesons")
+        indexes = (
+            models.Index(
+                fields=("film_work",),
+                name="person_film_work_film_work_idx",
+            ),
+            models.Index(
+                fields=("person",),
+                name="person_film_work_person_idx",
+            ),
+        )
 
     def __str__(self):
         return _(
@@ -168,3 +278,109 @@ class PersonFilmWork(UUIDMixin, TimeStampedMixin):
             "film_work": self.film_work.title,
             "person": self.person.full_name,
         }
+
+
+class FilmWorkCatalog(models.Model):
+    """Материализованное представление c жанрами и персонами фильмов,
+    сгруппированными по ролям.
+    """
+
+    id = models.UUIDField(primary_key=True)
+    title = models.CharField(_("name"), max_length=255)
+    description = models.TextField(_("description"))
+    creation_date = models.DateField(_("release date"), null=True)
+    rating = models.FloatField(_("rating"), null=True)
+    type = models.CharField(
+        _("type"),
+        max_length=max(len(role) for role, _ in FilmWorkType.choices),
+        choices=FilmWorkType.choices,
+    )
+    created_at = models.DateTimeField(_("creation time"))
+    updated_at = models.DateTimeField(_("modification time"))
+    genres = ArrayField(models.TextField(), verbose_name=_("genres"))
+    actors = ArrayField(models.TextField(), verbose_name=_("actors"))
+    directors = ArrayField(models.TextField(), verbose_name=_("directors"))
+    writers = ArrayField(models.TextField(), verbose_name=_("writers"))
+
+    class Meta:
+        managed = False
+        db_table = "content\".\"film_work_catalog"  # noqa: Q003
+        verbose_name = _("film catalogue entry")
+        verbose_name_plural = _("film catalogue")
+        ordering = ("title", )
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def refresh(cls, concurrently: bool = True):
+        """Обновляет материализованное представление.
+
+        Без блокировки чтения обновление возможно только для уже
+        заполненного представления.
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        concurrently_sql = "CONCURRENTLY" if concurrently else ""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"REFRESH MATERIALIZED VIEW {concurrently_sql} {table}",
+            )
+
+
+class FilmWorkOutbox(models.Model):
+    """Очередь идентификаторов изменённых фильмов для внешних
+    потребителей. Заполняется триггерами базы данных.
+    """
+
+    film_work_id = models.UUIDField(primary_key=True)
+    changed_at = models.DateTimeField(_("modification time"))
+
+    class Meta:
+        db_table = "content\".\"film_work_outbox"  # noqa: Q003
+        verbose_name = _("film change")
+        verbose_name_plural = _("film changes")
+        indexes = (
+            models.Index(
+                fields=("changed_at",),
+                name="film_work_outbox_changed_idx",
+            ),
+        )
+
+    def __str__(self):
+        return str(self.film_work_id)
+
+
+class CatalogueStatKind(models.TextChoices):
+    RATING = "rating", _("rating")
+    TYPE = "type", _("type")
+    YEAR = "year", _("release year")
+
+
+class CatalogueStat(models.Model):
+    """Количество фильмов каталога в корзине статистики, например
+    в интервале рейтинга или в году выхода. Поддерживается триггерами
+    таблицы фильмов.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(
+        _("kind"),
+        max_length=max(len(kind) for kind, _ in CatalogueStatKind.choices),
+        choices=CatalogueStatKind.choices,
+    )
+    key = models.CharField(_("key"), max_length=32)
+    value = models.IntegerField(_("film count"), default=0)
+
+    class Meta:
+        db_table = "content\".\"catalogue_stat"  # noqa: Q003
+        verbose_name = _("catalogue statistic")
+        verbose_name_plural = _("catalogue statistics")
+        constraints = (
+            models.UniqueConstraint(
+                fields=("kind", "key"),
+                name="catalogue_stat_kind_key_uniq",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.kind}:{self.key}"
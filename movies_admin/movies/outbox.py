@@ -0,0 +1,83 @@
+import logging
+import uuid
+from collections.abc import Callable
+
+from django.db import connection, transaction
+
+from .models import FilmWorkOutbox
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 500
+
+
+def claim_film_work_changes(batch_size: int) -> list[FilmWorkOutbox]:
+    """Удаляет из очереди пачку самых старых изменений и возвращает её.
+
+    Строки выбираются через FOR UPDATE SKIP LOCKED, поэтому несколько
+    обработчиков забирают разные пачки, не дожидаясь друг друга.
+    Блокировки снимаются, как только транзакция удаления фиксируется.
+    """
+    table = connection.ops.quote_name(FilmWorkOutbox._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE film_work_id IN ("  # noqa: S608
+            f"SELECT film_work_id FROM {table} "
+            "ORDER BY changed_at LIMIT %s FOR UPDATE SKIP LOCKED"
+            ") RETURNING film_work_id, changed_at",
+            [batch_size],
+        )
+        rows = cursor.fetchall()
+    return sorted(
+        (
+            FilmWorkOutbox(film_work_id=film_work_id, changed_at=changed_at)
+            for film_work_id, changed_at in rows
+        ),
+        key=lambda change: change.changed_at,
+    )
+
+
+def consume_film_work_changes(
+        handler: Callable[[list[uuid.UUID]], None],
+        batch_size: int = OUTBOX_BATCH_SIZE,
+) -> int:
+    """Забирает пачку изменённых фильмов и передаёт их идентификаторы
+    обработчику.
+
+    Пачка удаляется из очереди до вызова обработчика, поэтому
+    обработчик не держит блокировок и изменения этих фильмов
+    не ждут окончания обработки. Если обработчик завершился исключением, пачка
+    возвращается в очередь c прежним временем изменения. Фильмы,
+    изменённые снова за время обработки, сохраняют более новую запись.
+    Функцию следует вызывать вне транзакции, иначе удаление пачки
+    фиксируется только вместе c внешней транзакцией.
+    """
+    changes = claim_film_work_changes(batch_size)
+    if not changes:
+        return 0
+    try:
+        handler([change.film_work_id for change in changes])
+    except Exception:
+        FilmWorkOutbox.objects.bulk_create(changes, ignore_conflicts=True)
+        raise
+    return len(changes)
+
+
+def drain_film_work_changes(
+        handler: Callable[[list[uuid.UUID]], None],
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        max_batches: int | None = None,
+) -> int:
+    """Разбирает очередь пачками, пока она не опустеет или не будет
+    обработано max_batches пачек, и возвращает число фильмов.
+    """
+    processed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        consumed = consume_film_work_changes(handler, batch_size)
+        if not consumed:
+            break
+        processed += consumed
+        batches += 1
+        logger.info(f"Consumed {processed} film work changes")
+    return processed
@@ -0,0 +1,63 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections, models
+
+REPLICA_DATABASE = "replica"
+
+use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+
+
+@contextmanager
+def read_primary() -> Iterator[None]:
+    """Направляет чтение внутри блока на основную базу, даже если
+    запрос допускает чтение c реплики.
+    """
+    token = use_replica.set(False)
+    try:
+        yield
+    finally:
+        use_replica.reset(token)
+
+
+class ReadReplicaRouter:
+    """Направляет чтение моделей каталога на реплику, если она
+    настроена и текущий запрос допускает отставание данных.
+    """
+
+    def db_for_read(
+            self,
+            model: type[models.Model],
+            **hints,  # noqa: ANN003
+    ) -> str | None:
+        if (
+            use_replica.get()
+            and model._meta.app_label == "movies"
+            and REPLICA_DATABASE in connections.databases
+        ):
+            return REPLICA_DATABASE
+        return None
+
+    def db_for_write(
+            self,
+            model: type[models.Model],
+            **hints,  # noqa: ANN003
+    ) -> str | None:
+        return None
+
+    def allow_relation(
+            self,
+            obj1: models.Model,
+            obj2: models.Model,
+            **hints,  # noqa: ANN003
+    ) -> bool | None:
+        return True
+
+    def allow_migrate(
+            self,
+            db: str,
+            app_label: str,
+            **hints,  # noqa: ANN003
+    ) -> bool | None:
+        return db != REPLICA_DATABASE
@@ -0,0 +1,109 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import (
+    bump_version,
+    invalidate_film_work_details,
+    invalidate_film_works,
+)
+from .models import FilmWork, Genre, GenreFilmWork, Person, PersonFilmWork
+
+# Кэш сбрасывается только после фиксации транзакции. Запись, которую
+# параллельный запрос заполнил старыми данными между изменением
+# и фиксацией, иначе пережила бы сброс.
+
+@receiver(post_save, sender=FilmWork)
+@receiver(post_delete, sender=FilmWork)
+def invalidate_film_work(
+        instance: FilmWork,
+        using: str,
+        **kwargs,  # noqa: ANN003
+):
+    transaction.on_commit(
+        partial(invalidate_film_works, [instance.pk]),
+        using=using,
+    )
+
+
+@receiver(post_save, sender=GenreFilmWork)
+@receiver(post_delete, sender=GenreFilmWork)
+@receiver(post_save, sender=PersonFilmWork)
+@receiver(post_delete, sender=PersonFilmWork)
+def invalidate_film_work_link(
+        instance: GenreFilmWork | PersonFilmWork,
+        using: str,
+        **kwargs,  # noqa: ANN003
+):
+    transaction.on_commit(
+        partial(invalidate_film_works, [instance.film_work_id]),
+        using=using,
+    )
+
+
+def linked_film_work_ids(instance: Genre | Person) -> list:
+    if isinstance(instance, Genre):
+        links = GenreFilmWork.objects.filter(genre_id=instance.pk)
+    else:
+        links = PersonFilmWork.objects.filter(person_id=instance.pk)
+    return list(links.values_list("film_work_id", flat=True).distinct())
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Person)
+def invalidate_related_film_works(
+        sender: type[Genre | Person],
+        instance: Genre | Person,
+        created: bool,
+        using: str,
+        **kwargs,  # noqa: ANN003
+):
+    transaction.on_commit(partial(bump_version, sender), using=using)
+    if not created:
+        transaction.on_commit(
+            partial(
+                invalidate_film_work_details,
+                linked_film_work_ids(instance),
+            ),
+            using=using,
+        )
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Person)
+def invalidate_model(
+        sender: type[Genre | Person],
+        using: str,
+        **kwargs,  # noqa: ANN003
+):
+    transaction.on_commit(partial(bump_version, sender), using=using)
+
+
+@receiver(m2m_changed, sender=GenreFilmWork)
+@receiver(m2m_changed, sender=PersonFilmWork)
+def invalidate_film_work_relation(
+        instance: Model,
+        action: str,
+        reverse: bool,
+        pk_set: set | None,
+        using: str,
+        **kwargs,  # noqa: ANN003
+):
+    if reverse and action == "pre_clear":
+        instance._cleared_film_work_ids = linked_film_work_ids(instance)
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        film_work_ids = [instance.pk]
+    elif pk_set:
+        film_work_ids = list(pk_set)
+    else:
+        film_work_ids = instance.__dict__.pop("_cleared_film_work_ids", [])
+    transaction.on_commit(
+        partial(invalidate_film_works, film_work_ids),
+        using=using,
+    )
@@ -0,0 +1,88 @@
+from django.db import connection
+from django.utils.translation import gettext_lazy as _
+
+from .models import (
+    CatalogueStat,
+    CatalogueStatKind,
+    FilmWorkType,
+    Genre,
+    Person,
+)
+
+TOP_SIZE = 10
+MISSING_KEY = "none"
+
+
+def rebuild_catalogue_stats():
+    """Пересчитывает таблицу статистики по всему каталогу.
+
+    Пока идёт пересчёт, запись в таблицу фильмов блокируется.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT "content"."rebuild_catalogue_stats"()')
+
+
+def get_bucket_label(kind: str, key: str) -> str:
+    if key == MISSING_KEY:
+        return _("Not specified")
+    if kind == CatalogueStatKind.RATING:
+        return f"{key}–{int(key) + 1}"
+    if kind == CatalogueStatKind.TYPE and key in FilmWorkType.values:
+        return FilmWorkType(key).label
+    return key
+
+
+def get_bucket_sort_key(key: str) -> tuple[bool, int | str]:
+    """Упорядочивает числовые корзины по значению, a корзину
+    без значения ставит в конец.
+    """
+    if key == MISSING_KEY:
+        return True, ""
+    return False, int(key) if key.isdigit() else key
+
+
+def get_catalogue_statistics(top_size: int = TOP_SIZE) -> dict:
+    """Собирает данные панели статистики каталога.
+
+    Значения читаются из заранее агрегированной таблицы
+    и счётчиков film_count по индексам, поэтому время построения
+    не зависит от размера каталога.
+    """
+    buckets: dict[str, list[dict]] = {kind: [] for kind in CatalogueStatKind}
+    for stat in CatalogueStat.objects.filter(value__gt=0):
+        buckets[stat.kind].append(
+            {
+                "key": stat.key,
+                "label": get_bucket_label(stat.kind, stat.key),
+                "value": stat.value,
+            },
+        )
+
+    total = sum(bucket["value"] for bucket in buckets[CatalogueStatKind.TYPE])
+    for kind_buckets in buckets.values():
+        kind_buckets.sort(
+            key=lambda bucket: get_bucket_sort_key(bucket["key"]),
+        )
+        for bucket in kind_buckets:
+            bucket["percent"] = (
+                round(bucket["value"] * 100 / total, 1) if total else 0
+            )
+
+    return {
+        "total": total,
+        "rating_buckets": buckets[CatalogueStatKind.RATING],
+        "type_buckets": buckets[CatalogueStatKind.TYPE],
+        "year_buckets": buckets[CatalogueStatKind.YEAR],
+        "top_genres": (
+            Genre.objects
+            .filter(film_count__gt=0)
+            .order_by("-film_count")
+            .only("name", "film_count")[:top_size]
+        ),
+        "top_persons": (
+            Person.objects
+            .filter(film_count__gt=0)
+            .order_by("-film_count")
+            .only("full_name", "film_count")[:top_size]
+        ),
+    }
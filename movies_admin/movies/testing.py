@@ -0,0 +1,55 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.db import connections
+from django.http import HttpResponse
+from django.test import Client
+
+from .instrumentation import QueryRecorder
+
+ADMIN_QUERY_BUDGETS = {
+    "admin:movies_filmwork_changelist": 12,
+    "admin:movies_filmworkcatalog_changelist": 10,
+    "admin:movies_genre_changelist": 10,
+    "admin:movies_person_changelist": 10,
+    "admin:movies_filmwork_change": 30,
+    "admin:movies_filmwork_statistics": 8,
+    "admin:autocomplete": 10,
+}
+
+
+@contextmanager
+def assert_max_queries(
+        budget: int,
+        using: str = "default",
+) -> Iterator[QueryRecorder]:
+    """Проверяет, что код внутри блока выполняет не больше ``budget``
+    запросов к базе.
+    """
+    recorder = QueryRecorder(keep_queries=True)
+    with connections[using].execute_wrapper(recorder):
+        yield recorder
+    queries = "\n".join(
+        f"{number}. {sql}"
+        for number, sql in enumerate(recorder.queries, start=1)
+    )
+    assert recorder.count <= budget, (
+        f"Выполнено {recorder.count} запросов при бюджете {budget}:\n"
+        f"{queries}"
+    )
+
+
+def assert_page_within_budget(
+        client: Client,
+        url: str,
+        budget: int,
+) -> HttpResponse:
+    """Запрашивает страницу и проверяет, что она открывается
+    и укладывается в бюджет запросов.
+    """
+    with assert_max_queries(budget):
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Страница {url} вернула код {response.status_code}"
+    )
+    return response
@@ -0,0 +1,625 @@
+import datetime
+import re
+import time
+import uuid
+from urllib.parse import urlencode
+
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Count, F, Value
+from django.db.models.functions import Concat
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .cache import film_work_detail_key, invalidate_film_work_details
+from .exports import iter_export_rows
+from .models import (
+    CatalogueStat,
+    FilmWork,
+    FilmWorkOutbox,
+    FilmWorkType,
+    Genre,
+    GenreFilmWork,
+    Person,
+    PersonFilmWork,
+    PersonRole,
+)
+from .outbox import consume_film_work_changes
+from .statistics import rebuild_catalogue_stats
+from .testing import ADMIN_QUERY_BUDGETS, assert_page_within_budget
+
+INDEX_SCAN_NODES = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+OUTBOX_CHECK_LOCKED_ROWS = 10
+EXPORT_FIRST_ROW_BUDGET = 1.0
+
+
+class TestQueryPlans:
+    """Проверяет, что ключевые запросы панели администратора
+    выполняются c использованием индексов.
+
+    Таблицы связей секционированы, и в их планах указываются индексы
+    секций, которые Postgres называет по шаблону
+    ``<секция>_<столбец>_idx``, поэтому ожидаемые индексы задаются
+    регулярными выражениями. Планы строятся по заполненным таблицам
+    и без запрета последовательного сканирования, иначе проверка
+    ничего не доказывает.
+    """
+
+    def __init__(self):
+        self.sample_id = uuid.uuid4()
+        self.queries = {
+            "person changelist ordering": (
+                Person.objects.order_by("full_name")[:100],
+                "person_full_name_idx",
+            ),
+            "person changelist film count ordering": (
+                Person.objects.order_by("-film_count")[:100],
+                "person_film_count_idx",
+            ),
+            "person film works": (
+                PersonFilmWork.objects.filter(person_id=self.sample_id),
+                r"person_film_work_p\d+_person_id_idx",
+            ),
+            "film work persons inline": (
+                PersonFilmWork.objects.filter(film_work_id=self.sample_id),
+                r"person_film_work_p\d+_film_work_id_idx",
+            ),
+            "genre film works": (
+                GenreFilmWork.objects.filter(genre_id=self.sample_id),
+                r"genre_film_work_p\d+_genre_id_idx",
+            ),
+            "film work rating filter": (
+                FilmWork.objects.filter(rating=7.5),
+                "film_work_rating_idx",
+            ),
+            "film work type filter": (
+                FilmWork.objects
+                .filter(type=FilmWorkType.TV_SHOW)
+                .order_by("-pk")[:100],
+                "film_work_type_id_idx",
+            ),
+        }
+        self.plans: dict[str, str] = {}
+
+    def __test_index_scans(self):
+        """Проверяет, что план каждого запроса содержит сканирование
+        по ожидаемому индексу и ни одна таблица или секция
+        не читается последовательно.
+        """
+        for name, (queryset, index_pattern) in self.queries.items():
+            plan = queryset.explain()
+            self.plans[name] = plan
+            assert any(node in plan for node in INDEX_SCAN_NODES), (
+                f"Запрос «{name}» выполняется без использования индексов:\n"
+                f"{plan}"
+            )
+            assert "Seq Scan" not in plan, (
+                f"Запрос «{name}» последовательно читает таблицу:\n"
+                f"{plan}"
+            )
+            assert re.search(index_pattern, plan), (
+                f"Запрос «{name}» не использует индекс {index_pattern}:\n"
+                f"{plan}"
+            )
+
+    def __call__(self):
+        self.__test_index_scans()
+
+
+class TestExportFirstRow:
+    """Проверяет, что выгрузка всего каталога отдаёт первую строку
+    быстрее ``EXPORT_FIRST_ROW_BUDGET`` секунд.
+
+    Выгрузка в запросе идёт вне транзакции, поэтому и проверка
+    запускается вне её. Результат имеет смысл на большом каталоге,
+    например заполненном командой seed_catalogue.
+    """
+
+    def __test_first_row(self):
+        """Замеряет время до первой строки выгрузки."""
+        rows = iter_export_rows(FilmWork.objects.all())
+        started = time.perf_counter()
+        try:
+            next(rows, None)
+            elapsed = time.perf_counter() - started
+        finally:
+            rows.close()
+        assert elapsed < EXPORT_FIRST_ROW_BUDGET, (
+            f"Первая строка выгрузки получена через {elapsed:.2f} c"
+        )
+
+    def __call__(self):
+        self.__test_first_row()
+
+
+class TestAdminQueryBudgets:
+    """Проверяет, что страницы панели администратора укладываются
+    в бюджет запросов к базе.
+    """
+
+    def __init__(self, client: Client):
+        self.client = client
+
+    def __test_changelists(self):
+        """Проверяет количество запросов списков объектов."""
+        for url_name, budget in ADMIN_QUERY_BUDGETS.items():
+            if url_name.endswith("_changelist"):
+                assert_page_within_budget(
+                    self.client,
+                    reverse(url_name),
+                    budget,
+                )
+
+    def __test_film_work_change_form(self):
+        """Проверяет количество запросов страницы фильма c наибольшим
+        числом персон.
+        """
+        film_work = (
+            FilmWork.objects
+            .annotate(credit_count=Count("person_film_works"))
+            .order_by("-credit_count")
+            .first()
+        )
+        if film_work is None:
+            return
+        url_name = "admin:movies_filmwork_change"
+        assert_page_within_budget(
+            self.client,
+            reverse(url_name, args=(film_work.pk,)),
+            ADMIN_QUERY_BUDGETS[url_name],
+        )
+
+    def __test_statistics(self):
+        """Проверяет количество запросов панели статистики каталога."""
+        url_name = "admin:movies_filmwork_statistics"
+        assert_page_within_budget(
+            self.client,
+            reverse(url_name),
+            ADMIN_QUERY_BUDGETS[url_name],
+        )
+
+    def __test_person_autocomplete(self):
+        """Проверяет количество запросов автодополнения персон."""
+        url_name = "admin:autocomplete"
+        query = urlencode(
+            {
+                "app_label": PersonFilmWork._meta.app_label,
+                "model_name": PersonFilmWork._meta.model_name,
+                "field_name": "person",
+                "term": "a",
+            },
+        )
+        assert_page_within_budget(
+            self.client,
+            f"{reverse(url_name)}?{query}",
+            ADMIN_QUERY_BUDGETS[url_name],
+        )
+
+    def __call__(self):
+        self.__test_changelists()
+        self.__test_film_work_change_form()
+        self.__test_person_autocomplete()
+        self.__test_statistics()
+
+
+class TestFilmWorkActions:
+    """Проверяет массовые действия c параметрами, отправляя форму
+    действий на страницу списка фильмов.
+    """
+
+    def __init__(self, client: Client):
+        self.client = client
+        self.url = reverse("admin:movies_filmwork_changelist")
+        self.film_works = [
+            FilmWork.objects.create(
+                title=f"action check {uuid.uuid4()}",
+                type=FilmWorkType.MOVIE,
+            )
+            for _ in range(2)
+        ]
+        self.genre = Genre.objects.create(name=f"genre {uuid.uuid4()}")
+        self.person = Person.objects.create(full_name="Action Check")
+
+    def run_action(self, action: str, **params: str):
+        response = self.client.post(
+            self.url,
+            {
+                "action": action,
+                "index": 0,
+                ACTION_CHECKBOX_NAME: [
+                    film_work.pk for film_work in self.film_works
+                ],
+                **params,
+            },
+        )
+        assert response.status_code == 302, (
+            f"Действие {action} вернуло код {response.status_code}"
+        )
+
+    def __test_set_rating(self):
+        """Проверяет установку рейтинга выбранным фильмам."""
+        self.run_action("set_rating", rating="7.5")
+        ratings = set(
+            FilmWork.objects
+            .filter(pk__in=[film_work.pk for film_work in self.film_works])
+            .values_list("rating", flat=True),
+        )
+        assert ratings == {7.5}, f"Рейтинги не изменены: {ratings}"
+
+    def __test_add_genre(self):
+        """Проверяет добавление жанра выбранным фильмам."""
+        self.run_action("add_genre", genre=str(self.genre.pk))
+        count = GenreFilmWork.objects.filter(genre=self.genre).count()
+        assert count == len(self.film_works), (
+            f"Жанр добавлен {count} фильмам из {len(self.film_works)}"
+        )
+
+    def __test_add_person(self):
+        """Проверяет добавление персоны c ролью выбранным фильмам."""
+        self.run_action(
+            "add_person",
+            person=str(self.person.pk),
+            role=PersonRole.DIRECTOR,
+        )
+        count = PersonFilmWork.objects.filter(
+            person=self.person,
+            role=PersonRole.DIRECTOR,
+        ).count()
+        assert count == len(self.film_works), (
+            f"Персона добавлена {count} фильмам из {len(self.film_works)}"
+        )
+
+    def __call__(self):
+        self.__test_set_rating()
+        self.__test_add_genre()
+        self.__test_add_person()
+
+
+class TestConditionalResponses:
+    """Проверяет ETag, ответы 304 и 400 API каталога."""
+
+    def __init__(self, client: Client):
+        self.client = client
+        self.film_work = FilmWork.objects.create(
+            title=f"etag check {uuid.uuid4()}",
+            type=FilmWorkType.MOVIE,
+        )
+        self.person = Person.objects.create(full_name="Etag Check")
+        PersonFilmWork.objects.create(
+            film_work=self.film_work,
+            person=self.person,
+            role=PersonRole.ACTOR,
+        )
+        self.url = reverse("api:film_work_detail", args=(self.film_work.pk,))
+
+    def __test_not_modified(self):
+        """Проверяет, что повторный запрос c ETag получает 304."""
+        response = self.client.get(self.url)
+        assert response.status_code == 200, response.status_code
+        etag = response.headers["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f"Ожидался ответ 304, получен {response.status_code}"
+        )
+
+    def __test_related_rename(self):
+        """Проверяет, что переименование персоны меняет ETag фильма,
+        хотя updated_at фильма остаётся прежним.
+        """
+        etag = self.client.get(self.url).headers["ETag"]
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            self.person.full_name = "Etag Check Renamed"
+            self.person.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            "После переименования персоны получен ответ "
+            f"{response.status_code} со старым ETag"
+        )
+        assert "Etag Check Renamed" in response.json()["actor_names"], (
+            f"Ответ содержит устаревшие имена: {response.json()}"
+        )
+
+    def __test_malformed_cursor(self):
+        """Проверяет, что некорректный курсор списка получает 400."""
+        response = self.client.get(
+            reverse("api:film_work_list"),
+            {"cursor": "not-a-uuid"},
+        )
+        assert response.status_code == 400, (
+            f"Ожидался ответ 400, получен {response.status_code}"
+        )
+
+    def __call__(self):
+        self.__test_not_modified()
+        self.__test_related_rename()
+        self.__test_malformed_cursor()
+
+
+class TestCacheInvalidation:
+    """Проверяет, что изменение персоны удаляет из кэша данные только
+    фильмов, в которых она участвует, и только после фиксации
+    транзакции.
+
+    Фиксация внутри проверки имитируется captureOnCommitCallbacks:
+    сама проверка выполняется в откатываемой транзакции.
+    """
+
+    def __init__(self, client: Client):
+        self.client = client
+        self.person = Person.objects.create(full_name="Cache Check")
+        self.film_work, self.other_film_work = (
+            FilmWork.objects.create(
+                title=f"cache check {uuid.uuid4()}",
+                type=FilmWorkType.MOVIE,
+            )
+            for _ in range(2)
+        )
+        PersonFilmWork.objects.create(
+            film_work=self.film_work,
+            person=self.person,
+            role=PersonRole.ACTOR,
+        )
+
+    def get_detail(self, film_work: FilmWork) -> dict:
+        response = self.client.get(
+            reverse("api:film_work_detail", args=(film_work.pk,)),
+        )
+        assert response.status_code == 200, response.status_code
+        return response.json()
+
+    def __test_person_rename(self):
+        """Проверяет, что переименование персоны удаляет запись
+        связанного фильма и сохраняет запись другого фильма.
+        """
+        self.get_detail(self.film_work)
+        self.get_detail(self.other_film_work)
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            self.person.full_name = "Cache Check Renamed"
+            self.person.save()
+        assert cache.get(film_work_detail_key(self.film_work.pk)) is None, (
+            "Запись фильма переименованной персоны осталась в кэше"
+        )
+        assert (
+            cache.get(film_work_detail_key(self.other_film_work.pk))
+            is not None
+        ), "Удалена запись фильма, не связанного c персоной"
+        actor_names = self.get_detail(self.film_work)["actor_names"]
+        assert "Cache Check Renamed" in actor_names, (
+            f"Ответ содержит устаревшие имена: {actor_names}"
+        )
+
+    def __test_fill_before_commit(self):
+        """Проверяет, что запись, заполненная после изменения персоны,
+        но до фиксации транзакции, удаляется при фиксации.
+        """
+        key = film_work_detail_key(self.film_work.pk)
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            self.person.full_name = "Cache Check Before Commit"
+            self.person.save()
+            self.get_detail(self.film_work)
+            assert cache.get(key) is not None, (
+                "Запись фильма удалена до фиксации транзакции"
+            )
+        assert cache.get(key) is None, (
+            "Запись, заполненная до фиксации транзакции, осталась в кэше"
+        )
+
+    def __call__(self):
+        try:
+            self.__test_person_rename()
+            self.__test_fill_before_commit()
+        finally:
+            invalidate_film_work_details(
+                (self.film_work.pk, self.other_film_work.pk),
+            )
+
+
+class TestFilmWorkOutbox:
+    """Проверяет очередь изменённых фильмов: заполнение триггерами,
+    удаление пачки до обработки, возврат пачки при ошибке обработчика
+    и разбор очереди c пропуском строк, заблокированных другим
+    обработчиком.
+    """
+
+    def __init__(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL lock_timeout = '5s'")
+        self.person = Person.objects.create(full_name="Outbox Check")
+        self.film_work = FilmWork.objects.create(
+            title=f"outbox check {uuid.uuid4()}",
+            type=FilmWorkType.MOVIE,
+        )
+        PersonFilmWork.objects.create(
+            film_work=self.film_work,
+            person=self.person,
+            role=PersonRole.ACTOR,
+        )
+
+    def is_queued(self) -> bool:
+        return FilmWorkOutbox.objects.filter(pk=self.film_work.pk).exists()
+
+    def move_to_front(self):
+        """Делает запись фильма самой старой в очереди, чтобы
+        следующая пачка начиналась c неё.
+        """
+        FilmWorkOutbox.objects.filter(pk=self.film_work.pk).update(
+            changed_at=datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC),
+        )
+
+    def __test_triggers(self):
+        """Проверяет, что переименование персоны ставит фильм
+        в очередь, a изменение film_count не ставит.
+        """
+        assert self.is_queued(), "Новый фильм не попал в очередь"
+        FilmWorkOutbox.objects.filter(pk=self.film_work.pk).delete()
+        Person.objects.filter(pk=self.person.pk).update(
+            film_count=F("film_count") + 1,
+        )
+        assert not self.is_queued(), (
+            "Изменение film_count персоны поставило фильм в очередь"
+        )
+        self.person.full_name = "Outbox Check Renamed"
+        self.person.save()
+        assert self.is_queued(), (
+            "Переименование персоны не поставило фильм в очередь"
+        )
+
+    def __test_failed_handler(self):
+        """Проверяет, что при ошибке обработчика пачка возвращается
+        в очередь c прежним временем изменения.
+        """
+        def fail(film_work_ids: list[uuid.UUID]):
+            raise RuntimeError(film_work_ids)
+
+        self.move_to_front()
+        try:
+            consume_film_work_changes(fail, batch_size=1)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("Ошибка обработчика не передана дальше")
+        change = FilmWorkOutbox.objects.filter(pk=self.film_work.pk).first()
+        assert change is not None, "Пачка не вернулась в очередь"
+        assert change.changed_at.year == 1970, (
+            f"Время изменения вернувшейся пачки: {change.changed_at}"
+        )
+
+    def __test_skip_locked(self):
+        """Проверяет, что пачка не включает строки, заблокированные
+        другим соединением, и выборка их не ждёт.
+
+        Второе соединение видит только зафиксированные строки,
+        поэтому блокирует первые из них; если таких нет, проверяется
+        лишь текст запроса.
+        """
+        self.film_work.save()
+        other = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            other.set_autocommit(False)
+            with other.cursor() as cursor:
+                cursor.execute(
+                    'SELECT film_work_id FROM "content"."film_work_outbox" '
+                    "ORDER BY changed_at LIMIT %s FOR UPDATE",
+                    [OUTBOX_CHECK_LOCKED_ROWS],
+                )
+                locked = {row[0] for row in cursor.fetchall()}
+            claimed: list[uuid.UUID] = []
+            with CaptureQueriesContext(connection) as queries:
+                consume_film_work_changes(
+                    claimed.extend,
+                    batch_size=OUTBOX_CHECK_LOCKED_ROWS,
+                )
+        finally:
+            other.rollback()
+            other.close()
+        assert any(
+            "FOR UPDATE SKIP LOCKED" in query["sql"] for query in queries
+        ), "Пачка выбирается без SKIP LOCKED"
+        assert claimed, "Из очереди не выбрано ни одной строки"
+        assert not locked.intersection(claimed), (
+            "В пачку попали строки, заблокированные другим соединением"
+        )
+
+    def __test_consume(self):
+        """Проверяет, что пачка удаляется из очереди ещё до вызова
+        обработчика и не возвращается после успешной обработки.
+        """
+        self.move_to_front()
+        claimed: list[uuid.UUID] = []
+        queued_during_handler: list[bool] = []
+
+        def handle(film_work_ids: list[uuid.UUID]):
+            claimed.extend(film_work_ids)
+            queued_during_handler.append(self.is_queued())
+
+        consume_film_work_changes(handle, batch_size=1)
+        assert claimed == [self.film_work.pk], (
+            f"Выбрана пачка {claimed} вместо изменённого фильма"
+        )
+        assert queued_during_handler == [False], (
+            "Пачка оставалась в очереди во время обработки"
+        )
+        assert not self.is_queued(), "Обработанный фильм остался в очереди"
+
+    def __call__(self):
+        self.__test_triggers()
+        self.__test_failed_handler()
+        self.__test_consume()
+        self.__test_skip_locked()
+
+
+class TestCatalogueStats:
+    """Проверяет, что статистика каталога, которую поддерживают
+    триггеры, совпадает c пересчитанной c нуля.
+    """
+
+    def __init__(self):
+        self.film_works = FilmWork.objects.bulk_create(
+            FilmWork(
+                title=f"stats check {uuid.uuid4()}",
+                type=film_type,
+                rating=rating,
+                creation_date=creation_date,
+            )
+            for film_type, rating, creation_date in (
+                (FilmWorkType.MOVIE, 9.5, datetime.date(1999, 1, 1)),
+                (FilmWorkType.MOVIE, 10.0, None),
+                (FilmWorkType.TV_SHOW, None, datetime.date(2005, 6, 1)),
+                (FilmWorkType.TV_SHOW, 3.2, datetime.date(2005, 6, 1)),
+            )
+        )
+        self.queryset = FilmWork.objects.filter(
+            pk__in=[film_work.pk for film_work in self.film_works],
+        )
+
+    def get_stats(self) -> dict[tuple[str, str], int]:
+        return {
+            (kind, key): value
+            for kind, key, value in CatalogueStat.objects
+            .exclude(value=0)
+            .values_list("kind", "key", "value")
+        }
+
+    def get_row_versions(self) -> set[tuple[int, str]]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT id, ctid::text FROM "content"."catalogue_stat"',
+            )
+            return set(cursor.fetchall())
+
+    def __test_title_update(self):
+        """Проверяет, что правка названий не обновляет строки
+        статистики.
+        """
+        versions = self.get_row_versions()
+        self.queryset.update(title=Concat("title", Value(" renamed")))
+        assert self.get_row_versions() == versions, (
+            "Правка названий изменила строки статистики"
+        )
+
+    def __test_rebuild_agreement(self):
+        """Проверяет совпадение статистики после вставки, обновления
+        полей корзин и удаления фильмов c результатом пересчёта.
+        """
+        self.queryset.filter(type=FilmWorkType.MOVIE).update(
+            rating=F("rating") - 5,
+            type=FilmWorkType.TV_SHOW,
+        )
+        self.queryset.filter(rating__isnull=True).update(
+            rating=7,
+            creation_date=None,
+        )
+        self.queryset.filter(rating__lt=4).delete()
+        stats = self.get_stats()
+        rebuild_catalogue_stats()
+        rebuilt = self.get_stats()
+        assert stats == rebuilt, (
+            "Статистика триггеров расходится c пересчётом: "
+            f"{set(stats.items()) ^ set(rebuilt.items())}"
+        )
+
+    def __call__(self):
+        self.__test_title_update()
+        self.__test_rebuild_agreement()
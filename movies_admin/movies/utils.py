@@ -0,0 +1,11 @@
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+
+def iter_batches(rows: Iterable, batch_size: int) -> Iterator[list]:
+    """Разбивает последовательность на списки по ``batch_size``
+    элементов, не читая её целиком.
+    """
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
@@ -0,0 +1,20 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.http import require_safe
+
+from .cache import get_cache_stats
+from .instrumentation import get_query_metrics
+
+
+@staff_member_required
+@require_safe
+def metrics(request: HttpRequest) -> JsonResponse:
+    """Статистика запросов к базе и попаданий в кэш текущего
+    процесса.
+    """
+    return JsonResponse(
+        {
+            "queries": get_query_metrics(),
+            "cache": get_cache_stats(),
+        },
+    )
@@ -105,7 +105,7 @@ class PostgresSaver:
         )
         query = (
             f"INSERT INTO {table_name} ({column_names_str}) VALUES "  # noqa: S608
-            f"{bind_values} ON CONFLICT (id) DO NOTHING"
+            f"{bind_values} ON CONFLICT DO NOTHING"
         )
 
         try:
@@ -34,6 +34,10 @@ class TestLoadData:
     def __test_equivalent_data(self):
         """Проверяет идентичность строк в таблицах
         баз данных SQLite и PostgreSQL.
+
+        Сравниваются только столбцы SQLite: в PostgreSQL есть
+        вычисляемые столбцы, например film_count и name_block,
+        которых нет в исходной базе.
         """
         sqlite_cursor = self.sqlite_conn.cursor()
         pg_cursor = self.pg_conn.cursor()
@@ -43,6 +47,9 @@ class TestLoadData:
 
             sqlite_cursor.execute(query)
             sqlite_execute_result = sqlite_cursor.fetchall()
+            columns = ", ".join(
+                column[0] for column in sqlite_cursor.description
+            )
             time_fields = ("created_at", "updated_at")
             sqlite_data = {
                   row["id"]: {
@@ -55,7 +62,9 @@ class TestLoadData:
                 for row in sqlite_execute_result
             }
 
-            pg_cursor.execute(query)
+            pg_cursor.execute(
+                f"SELECT {columns} FROM {table_name};",  # noqa: S608
+            )
             pg_execute_result = pg_cursor.fetchall()
             pg_data = {row["id"]: dict(row) for row in pg_execute_result}
 